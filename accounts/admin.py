@@ -1,5 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Count
+from flowboard.paginator import LargeTablePaginator
 from .models import User, Organization, UserOrganizationMembership
 
 
@@ -9,6 +11,10 @@ class UserOrganizationMembershipInline(admin.TabularInline):
     extra = 0
     fields = ['organization', 'role', 'joined_at']
     readonly_fields = ['joined_at']
+    autocomplete_fields = ['organization']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('organization', 'user')
 
 
 @admin.register(Organization)
@@ -16,9 +22,11 @@ class OrganizationAdmin(admin.ModelAdmin):
     """Admin configuration for Organization model."""
     list_display = ['name', 'code', 'created_by', 'member_count', 'created_at']
     list_filter = ['created_at']
-    search_fields = ['name', 'code', 'description']
+    search_fields = ['name']
     readonly_fields = ['code', 'created_at', 'updated_at']
+    autocomplete_fields = ['created_by']
     inlines = [UserOrganizationMembershipInline]
+    paginator = LargeTablePaginator
 
     fieldsets = (
         ('Organization Info', {
@@ -29,10 +37,27 @@ class OrganizationAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate member counts and join the creator so the changelist doesn't query per row."""
+        return super().get_queryset(request).annotate(
+            _member_count=Count('user_memberships')
+        ).select_related('created_by').defer('description')
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match organization codes by case-sensitive prefix so the code index is used;
+        everything else falls back to the name search.
+        """
+        code = search_term.strip().upper()
+        if code.startswith('ORG-'):
+            return queryset.filter(code__startswith=code), False
+        return super().get_search_results(request, queryset, search_term)
+
     def member_count(self, obj):
         """Display number of members in organization."""
-        return obj.user_memberships.count()
+        return obj._member_count
     member_count.short_description = 'Members'
+    member_count.admin_order_field = '_member_count'
 
 
 @admin.register(UserOrganizationMembership)
@@ -42,6 +67,9 @@ class UserOrganizationMembershipAdmin(admin.ModelAdmin):
     list_filter = ['role', 'joined_at', 'organization']
     search_fields = ['user__username', 'user__email', 'organization__name']
     readonly_fields = ['joined_at']
+    list_select_related = ['user', 'organization']
+    autocomplete_fields = ['user', 'organization']
+    paginator = LargeTablePaginator
 
 
 @admin.register(User)
@@ -51,10 +79,12 @@ class CustomUserAdmin(UserAdmin):
     list_filter = ['is_staff', 'is_superuser', 'is_active', 'current_organization']
     search_fields = ['username', 'email', 'first_name', 'last_name']
     inlines = [UserOrganizationMembershipInline]
+    paginator = LargeTablePaginator
+    autocomplete_fields = ['current_organization']
 
     fieldsets = UserAdmin.fieldsets + (
         ('Organization Info', {
-            'fields': ('current_organization', 'organization')
+            'fields': ('current_organization',)
         }),
         ('Additional Info', {
             'fields': ('phone_number',)
@@ -63,14 +93,21 @@ class CustomUserAdmin(UserAdmin):
 
     add_fieldsets = UserAdmin.add_fieldsets + (
         ('Organization Info', {
-            'fields': ('current_organization', 'organization')
+            'fields': ('current_organization',)
         }),
         ('Additional Info', {
             'fields': ('email', 'phone_number')
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate org counts and join the current organization shown in list_display."""
+        return super().get_queryset(request).annotate(
+            _org_count=Count('organization_memberships')
+        ).select_related('current_organization')
+
     def org_count(self, obj):
         """Display number of organizations user belongs to."""
-        return obj.organization_memberships.count()
+        return obj._org_count
     org_count.short_description = 'Orgs'
+    org_count.admin_order_field = '_org_count'
@@ -1,3 +1,4 @@
+import re
 from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm, PasswordResetForm
 from .models import User, Organization
@@ -44,14 +45,6 @@ class UserRegistrationForm(UserCreationForm):
             'placeholder': 'Confirm password'
         })
 
-    def save(self, commit=True):
-        user = super().save(commit=False)
-        user.email = self.cleaned_data['email']
-        user.phone_number = self.cleaned_data.get('phone_number', '')
-        if commit:
-            user.save()
-        return user
-
 
 class UserLoginForm(AuthenticationForm):
     """
@@ -107,16 +100,22 @@ class OrganizationCreateForm(forms.ModelForm):
         }
 
 
+ORGANIZATION_CODE_RE = re.compile(r'ORG-[A-Z0-9]{6}')
+
+
 class OrganizationJoinForm(forms.Form):
     """
     Form for joining an existing organization using a code.
     """
     organization_code = forms.CharField(
-        max_length=20,
+        max_length=10,
         required=True,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
             'placeholder': 'Enter organization code (e.g., ORG-ABC123)',
+            'pattern': 'ORG-[A-Z0-9]{6}',
+            'autocapitalize': 'characters',
+            'oninput': 'this.value = this.value.toUpperCase()',
             'style': 'text-transform: uppercase;'
         }),
         label='Organization Code',
@@ -125,9 +124,13 @@ class OrganizationJoinForm(forms.Form):
 
     def clean_organization_code(self):
         code = self.cleaned_data.get('organization_code', '').strip().upper()
+        # Malformed codes can't match anything, so don't spend a lookup on them
+        if not ORGANIZATION_CODE_RE.fullmatch(code):
+            raise forms.ValidationError('Invalid organization code. Please check and try again.')
         try:
-            organization = Organization.objects.get(code=code)
-            self.cleaned_data['organization'] = organization
-            return code
+            # Only the columns needed for joining and messages; skip the description TEXT
+            organization = Organization.objects.only('id', 'name', 'code').get(code=code)
         except Organization.DoesNotExist:
             raise forms.ValidationError('Invalid organization code. Please check and try again.')
+        self.cleaned_data['organization'] = organization
+        return code
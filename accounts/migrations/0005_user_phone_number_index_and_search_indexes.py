@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:09
+
+from django.db import migrations, models
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Create trigram indexes backing the admin's case-insensitive username/email search.
+    Django emits `UPPER(col::text) LIKE UPPER('%q%')` for icontains, so the indexes
+    are built on the same expression. Only supported on PostgreSQL (pg_trgm).
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS user_username_trgm '
+        'ON users USING gin (UPPER(username::text) gin_trgm_ops)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS user_email_trgm '
+        'ON users USING gin (UPPER(email::text) gin_trgm_ops)'
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS user_username_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS user_email_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_migrate_organization_memberships'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='phone_number',
+            field=models.CharField(blank=True, db_index=True, help_text='Phone number for SMS notifications', max_length=20, null=True),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_phone_number_index_and_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='organization',
+        ),
+    ]
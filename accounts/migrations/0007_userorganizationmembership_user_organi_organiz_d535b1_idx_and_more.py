@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_remove_user_organization'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userorganizationmembership',
+            index=models.Index(fields=['organization', 'role'], name='user_organi_organiz_d535b1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userorganizationmembership',
+            index=models.Index(fields=['user', 'role'], name='user_organi_user_id_af80b9_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:12
+
+from django.db import migrations, models
+
+
+def use_c_collation(apps, schema_editor):
+    """
+    Switch organization codes to byte-wise "C" collation on PostgreSQL.
+    Codes are ASCII-only, so locale-aware comparison only slows the unique
+    index and prefix lookups down. Not expressed as db_collation on the
+    field because SQLite has no "C" collation.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('ALTER TABLE organizations ALTER COLUMN code TYPE varchar(10) COLLATE "C"')
+
+
+def use_default_collation(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('ALTER TABLE organizations ALTER COLUMN code TYPE varchar(10) COLLATE "default"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_userorganizationmembership_user_organi_organiz_d535b1_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='organization',
+            name='code',
+            field=models.CharField(help_text='Unique organization code for inviting members', max_length=10, unique=True),
+        ),
+        migrations.RunPython(use_c_collation, use_default_collation),
+    ]
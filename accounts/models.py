@@ -1,7 +1,9 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction, IntegrityError
+from django.utils.functional import cached_property
+import base64
 import secrets
-import string
 
 
 class Organization(models.Model):
@@ -10,7 +12,7 @@ class Organization(models.Model):
     Users can only add members from their own organization to workspaces.
     """
     name = models.CharField(max_length=200, help_text="Organization name")
-    code = models.CharField(max_length=20, unique=True, help_text="Unique organization code for inviting members")
+    code = models.CharField(max_length=10, unique=True, help_text="Unique organization code for inviting members")
     description = models.TextField(blank=True, null=True, help_text="Organization description")
     created_by = models.ForeignKey('User', on_delete=models.SET_NULL, null=True, related_name='created_organizations')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -19,19 +21,42 @@ class Organization(models.Model):
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def get_cache_key(organization_id):
+        """Cache key for an organization's settings-page summary (see accounts.signals)."""
+        return f'org_summary:{organization_id}'
+
+    # Number of fresh codes to try before giving up on a colliding insert
+    CODE_GENERATION_ATTEMPTS = 5
+
     @staticmethod
     def generate_unique_code():
-        """Generate a unique organization code like ORG-ABC123"""
-        while True:
-            # Generate random code: ORG-XXXXXX (6 characters: letters and numbers)
-            code = 'ORG-' + ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(6))
-            if not Organization.objects.filter(code=code).exists():
-                return code
+        """
+        Generate an organization code like ORG-ABC123.
+        Uniqueness is enforced by the unique index on `code` when saving.
+        """
+        # Generate random code: ORG-XXXXXX (6 characters: letters and numbers).
+        # One entropy draw; the base32 alphabet (A-Z, 2-7) stays within the code format.
+        return 'ORG-' + base64.b32encode(secrets.token_bytes(5)).decode('ascii')[:6]
 
     def save(self, *args, **kwargs):
-        if not self.code:
+        if self.code:
+            super().save(*args, **kwargs)
+            return
+
+        # Let the unique index reject collisions instead of checking beforehand
+        for attempt in range(self.CODE_GENERATION_ATTEMPTS):
             self.code = self.generate_unique_code()
-        super().save(*args, **kwargs)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                # Only a code collision is worth another code; any other violation is re-raised
+                collided = Organization.objects.filter(code=self.code).exists()
+                self.code = ''
+                if not collided or attempt == self.CODE_GENERATION_ATTEMPTS - 1:
+                    raise
 
     class Meta:
         db_table = 'organizations'
@@ -59,6 +84,10 @@ class UserOrganizationMembership(models.Model):
     class Meta:
         db_table = 'user_organization_memberships'
         unique_together = ['user', 'organization']
+        indexes = [
+            models.Index(fields=['organization', 'role']),
+            models.Index(fields=['user', 'role']),
+        ]
         verbose_name = 'User Organization Membership'
         verbose_name_plural = 'User Organization Memberships'
         ordering = ['-joined_at']
@@ -66,6 +95,26 @@ class UserOrganizationMembership(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.organization.name} ({self.role})"
 
+    @staticmethod
+    def get_user_cache_key(user_id):
+        """Cache key for a user's (organization id, role) list (see accounts.signals)."""
+        return f'user_orgs:{user_id}'
+
+    @classmethod
+    def bulk_add(cls, users, organization, role='member'):
+        """
+        Add many users to an organization in batched INSERTs.
+        Existing memberships are left untouched (deduplicated by unique_together).
+        """
+        memberships = [cls(user=user, organization=organization, role=role) for user in users]
+        created = cls.objects.bulk_create(memberships, ignore_conflicts=True, batch_size=500)
+        # bulk_create sends no post_save, so drop the cached organization lists and member count here
+        cache.delete_many(
+            [cls.get_user_cache_key(membership.user_id) for membership in memberships]
+            + [Organization.get_cache_key(organization.pk)]
+        )
+        return created
+
 
 class User(AbstractUser):
     """
@@ -73,7 +122,7 @@ class User(AbstractUser):
     Adds phone number for SMS notifications and organization membership.
     Users can now belong to multiple organizations.
     """
-    phone_number = models.CharField(max_length=20, blank=True, null=True, help_text="Phone number for SMS notifications")
+    phone_number = models.CharField(max_length=20, blank=True, null=True, db_index=True, help_text="Phone number for SMS notifications")
     email = models.EmailField(unique=True)
 
     # New: Many-to-many relationship with organizations
@@ -94,26 +143,28 @@ class User(AbstractUser):
         help_text="User's currently active organization"
     )
 
-    # Old field: Keep for backward compatibility during migration, will be deprecated
-    organization = models.ForeignKey(
-        Organization,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        related_name='members',
-        help_text="[DEPRECATED] Use current_organization instead"
-    )
-
     def __str__(self):
         return self.username
 
+    @cached_property
+    def organization_roles(self):
+        """
+        Map of organization id to this user's role.
+        Loaded once per instance (so once per request for request.user); iterates .all()
+        so a prefetch_related('organization_memberships') cache is reused.
+        """
+        return {membership.organization_id: membership.role for membership in self.organization_memberships.all()}
+
+    @property
+    def member_org_ids(self):
+        """Ids of the organizations this user belongs to (backed by organization_roles)."""
+        return self.organization_roles.keys()
+
     def get_role_in_organization(self, organization):
         """Get user's role in a specific organization."""
-        try:
-            membership = self.organization_memberships.get(organization=organization)
-            return membership.role
-        except UserOrganizationMembership.DoesNotExist:
+        if organization is None:
             return None
+        return self.organization_roles.get(organization.pk)
 
     def is_admin_in_organization(self, organization):
         """Check if user is admin or owner in a specific organization."""
@@ -0,0 +1,29 @@
+"""
+Signal handlers that keep cached organization data in sync with organizations and memberships.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Organization, UserOrganizationMembership
+
+
+@receiver(post_save, sender=UserOrganizationMembership)
+@receiver(post_delete, sender=UserOrganizationMembership)
+def invalidate_user_organizations(sender, instance, **kwargs):
+    """
+    Drop the member's cached organization list and the organization's cached member
+    count when a membership is created, changed or deleted.
+    """
+    cache.delete_many([
+        UserOrganizationMembership.get_user_cache_key(instance.user_id),
+        Organization.get_cache_key(instance.organization_id),
+    ])
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_organization_summary(sender, instance, **kwargs):
+    """
+    Drop the organization's cached summary when it is renamed, edited or deleted.
+    """
+    cache.delete(Organization.get_cache_key(instance.pk))
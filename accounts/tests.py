@@ -1,3 +1,187 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import IntegrityError
 from django.test import TestCase
+from django.urls import reverse
+from .forms import OrganizationJoinForm
+from .models import Organization, User, UserOrganizationMembership
 
-# Create your tests here.
+
+class JoinOrganizationTests(TestCase):
+    """Joining by code checks the code against the organizations that exist now."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.user = User.objects.create_user('joiner', 'joiner@example.com', 'pw')
+        self.organization = Organization.objects.create(name='Org', created_by=self.owner)
+        self.client.force_login(self.user)
+
+    def join(self, code):
+        return self.client.post(reverse('accounts:join_organization'), {'organization_code': code})
+
+    def test_join(self):
+        response = self.join(self.organization.code)
+        self.assertRedirects(response, reverse('accounts:organization_settings'), fetch_redirect_response=False)
+        self.assertTrue(UserOrganizationMembership.objects.filter(user=self.user, organization=self.organization).exists())
+
+    def test_deleted_organization(self):
+        code = self.organization.code
+        self.join(code)
+        self.organization.delete()
+        other = User.objects.create_user('other', 'other@example.com', 'pw')
+        self.client.force_login(other)
+        response = self.join(code)
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context['form'], 'organization_code', 'Invalid organization code. Please check and try again.')
+        self.assertFalse(UserOrganizationMembership.objects.filter(user=other).exists())
+
+    def test_malformed_code_is_rejected_without_lookup(self):
+        with self.assertNumQueries(0):
+            form = OrganizationJoinForm({'organization_code': 'nope'})
+            self.assertFalse(form.is_valid())
+
+
+class OrganizationCodeTests(TestCase):
+    """Organization.save retries with a new code only when the code collided."""
+
+    def setUp(self):
+        self.existing = Organization.objects.create(name='Existing')
+
+    def test_collision_retries_with_new_code(self):
+        codes = [self.existing.code, 'ORG-FRESH1']
+        with mock.patch.object(Organization, 'generate_unique_code', side_effect=codes) as generate:
+            organization = Organization.objects.create(name='New')
+        self.assertEqual(generate.call_count, 2)
+        self.assertEqual(organization.code, 'ORG-FRESH1')
+
+    def test_collisions_give_up_after_attempts(self):
+        with mock.patch.object(Organization, 'generate_unique_code', return_value=self.existing.code) as generate:
+            with self.assertRaises(IntegrityError):
+                Organization.objects.create(name='New')
+        self.assertEqual(generate.call_count, Organization.CODE_GENERATION_ATTEMPTS)
+
+    def test_other_integrity_errors_are_not_retried(self):
+        with mock.patch.object(Organization, 'generate_unique_code', return_value='ORG-FRESH1') as generate, \
+                mock.patch('django.db.models.Model.save', side_effect=IntegrityError('other constraint')):
+            with self.assertRaises(IntegrityError):
+                Organization(name='New').save()
+        self.assertEqual(generate.call_count, 1)
+
+
+class RegisterOrganizationTests(TestCase):
+    """Registration adds the new user to the organization they create or join."""
+
+    def setUp(self):
+        cache.clear()
+
+    def register(self, username, **data):
+        return self.client.post(reverse('accounts:register'), {
+            'username': username,
+            'email': f'{username}@example.com',
+            'password1': 'a-long-Passw0rd',
+            'password2': 'a-long-Passw0rd',
+            **data,
+        })
+
+    def test_create_makes_owner(self):
+        response = self.register('founder', organization_type='create', name='New Org')
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        user = User.objects.get(username='founder')
+        membership = UserOrganizationMembership.objects.get(user=user)
+        self.assertEqual((membership.organization.name, membership.role), ('New Org', 'owner'))
+        self.assertEqual(user.current_organization_id, membership.organization_id)
+
+    def test_join_makes_member(self):
+        organization = Organization.objects.create(name='Org')
+        response = self.register('joiner', organization_type='join', organization_code=organization.code)
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        membership = UserOrganizationMembership.objects.get(user__username='joiner')
+        self.assertEqual((membership.organization_id, membership.role), (organization.pk, 'member'))
+
+
+class RemoveOrganizationMemberTests(TestCase):
+    """Owners and admins remove members; admins can't remove owners and nobody removes themselves."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        self.organization = Organization.objects.create(name='Org', created_by=self.owner)
+        self.other_organization = Organization.objects.create(name='Other', created_by=self.owner)
+        for user, role in ((self.owner, 'owner'), (self.admin, 'admin'), (self.member, 'member')):
+            UserOrganizationMembership.objects.create(user=user, organization=self.organization, role=role)
+        UserOrganizationMembership.objects.create(user=self.member, organization=self.other_organization)
+        User.objects.filter(pk=self.member.pk).update(current_organization=self.organization)
+        self.members_url = reverse('accounts:organization_members_detail', args=[self.organization.pk])
+
+    def remove(self, user, method='post'):
+        url = reverse('accounts:remove_organization_member', args=[self.organization.pk, user.pk])
+        return getattr(self.client, method)(url)
+
+    def is_member(self, user):
+        return UserOrganizationMembership.objects.filter(user=user, organization=self.organization).exists()
+
+    def test_get_redirects_without_removing(self):
+        self.client.force_login(self.owner)
+        response = self.remove(self.member, method='get')
+        self.assertRedirects(response, self.members_url, fetch_redirect_response=False)
+        self.assertTrue(self.is_member(self.member))
+
+    def test_admin_removes_member(self):
+        self.client.force_login(self.admin)
+        response = self.remove(self.member)
+        self.assertRedirects(response, self.members_url, fetch_redirect_response=False)
+        self.assertFalse(self.is_member(self.member))
+        # The removed member's current organization moves to one they still belong to
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.current_organization_id, self.other_organization.pk)
+
+    def test_admin_cannot_remove_owner(self):
+        self.client.force_login(self.admin)
+        response = self.remove(self.owner)
+        self.assertRedirects(response, self.members_url, fetch_redirect_response=False)
+        self.assertTrue(self.is_member(self.owner))
+
+    def test_cannot_remove_self(self):
+        self.client.force_login(self.owner)
+        response = self.remove(self.owner)
+        self.assertRedirects(response, self.members_url, fetch_redirect_response=False)
+        self.assertTrue(self.is_member(self.owner))
+
+    def test_member_cannot_remove(self):
+        self.client.force_login(self.member)
+        response = self.remove(self.admin)
+        self.assertRedirects(response, reverse('accounts:organization_settings'), fetch_redirect_response=False)
+        self.assertTrue(self.is_member(self.admin))
+
+
+class OrganizationSettingsCacheTests(TestCase):
+    """Cached organization data is shared by all members and goes stale on any member's change."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.organization = Organization.objects.create(name='Org', created_by=self.owner)
+        UserOrganizationMembership.objects.create(user=self.owner, organization=self.organization, role='owner')
+        self.client.force_login(self.owner)
+
+    def summary(self):
+        response = self.client.get(reverse('accounts:organization_settings'))
+        entry, = response.context['organizations_data']
+        return entry['organization'].name, entry['members_count']
+
+    def test_other_member_joining_updates_count(self):
+        self.assertEqual(self.summary(), ('Org', 1))
+        joiner = User.objects.create_user('joiner', 'joiner@example.com', 'pw')
+        UserOrganizationMembership.objects.create(user=joiner, organization=self.organization)
+        self.assertEqual(self.summary(), ('Org', 2))
+        UserOrganizationMembership.bulk_add([User.objects.create_user('bulk', 'bulk@example.com', 'pw')], self.organization)
+        self.assertEqual(self.summary(), ('Org', 3))
+
+    def test_rename_is_seen(self):
+        self.assertEqual(self.summary(), ('Org', 1))
+        self.organization.name = 'Renamed'
+        self.organization.save()
+        self.assertEqual(self.summary(), ('Renamed', 1))
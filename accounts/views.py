@@ -1,15 +1,29 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.contrib import messages
 from django.urls import reverse_lazy
+from django.db import IntegrityError, transaction
+from django.db.models import Count
 from django.contrib.auth.views import (
     PasswordResetView,
     PasswordResetDoneView,
     PasswordResetConfirmView,
     PasswordResetCompleteView
 )
-from .forms import UserRegistrationForm, UserLoginForm, CustomPasswordResetForm
+from workspaces.models import WorkspaceInvitation
+from .forms import (
+    UserRegistrationForm,
+    UserLoginForm,
+    CustomPasswordResetForm,
+    OrganizationCreateForm,
+    OrganizationJoinForm
+)
+from .models import Organization, User, UserOrganizationMembership
+
+# Seconds a user's organization list stays cached on the settings page
+ORGANIZATIONS_CACHE_TIMEOUT = 120
 
 
 def register_view(request):
@@ -25,9 +39,8 @@ def register_view(request):
     invitation = None
 
     if invitation_token:
-        from workspaces.models import WorkspaceInvitation
         try:
-            invitation = WorkspaceInvitation.objects.get(token=invitation_token)
+            invitation = WorkspaceInvitation.objects.select_related('workspace').get(token=invitation_token)
             if not invitation.is_valid():
                 messages.warning(request, 'The invitation link has expired.')
                 del request.session['invitation_token']
@@ -36,13 +49,11 @@ def register_view(request):
             del request.session['invitation_token']
 
     if request.method == 'POST':
-        from .forms import OrganizationCreateForm, OrganizationJoinForm
-        from .models import Organization
-
         form = UserRegistrationForm(request.POST)
         org_type = request.POST.get('organization_type')
-        org_create_form = OrganizationCreateForm(request.POST) if org_type == 'create' else OrganizationCreateForm()
-        org_join_form = OrganizationJoinForm(request.POST) if org_type == 'join' else OrganizationJoinForm()
+        # Only bind the form for the chosen branch; the other is built if the page is re-rendered
+        org_create_form = OrganizationCreateForm(request.POST) if org_type == 'create' else None
+        org_join_form = OrganizationJoinForm(request.POST) if org_type == 'join' else None
 
         # Validate based on organization type
         org_valid = True
@@ -56,64 +67,64 @@ def register_view(request):
                 organization = org_join_form.cleaned_data.get('organization')
 
         if form.is_valid() and org_valid:
-            from .models import UserOrganizationMembership
-
-            user = form.save(commit=False)
-            user.save()  # Save user first before creating organization
-
-            # Handle organization
-            if org_type == 'create':
-                # Create new organization
-                organization = org_create_form.save(commit=False)
-                organization.created_by = user  # Now user is saved and has a primary key
-                organization.save()
-
-                # Create membership with 'owner' role
-                UserOrganizationMembership.objects.create(
-                    user=user,
-                    organization=organization,
-                    role='owner'
-                )
-
-                # Set as current organization
-                user.current_organization = organization
-                user.organization = organization  # Keep for backward compatibility
-                user.save()
-            elif org_type == 'join':
-                # Join existing organization
-                UserOrganizationMembership.objects.create(
-                    user=user,
-                    organization=organization,
-                    role='member'
-                )
-
-                # Set as current organization
-                user.current_organization = organization
-                user.organization = organization  # Keep for backward compatibility
-                user.save()
-
-            login(request, user)
-
-            # If there's a valid invitation, accept it
-            if invitation:
-                invitation.accept(user)
-                del request.session['invitation_token']
-                messages.success(request, f'Registration successful! You have been added to {invitation.workspace.name}.')
-                return redirect('workspaces:detail', pk=invitation.workspace.pk)
+            try:
+                with transaction.atomic():
+                    user = form.save()  # Save user first before creating organization
+
+                    # Handle organization
+                    if org_type == 'create':
+                        # Create new organization
+                        organization = org_create_form.save(commit=False)
+                        organization.created_by = user  # Now user is saved and has a primary key
+                        organization.save()
+
+                        # Create membership with 'owner' role
+                        UserOrganizationMembership.bulk_add([user], organization, role='owner')
+                    elif org_type == 'join':
+                        # Lock the organization so it can't be deleted before the membership is inserted
+                        organization = Organization.objects.select_for_update().only(
+                            'id', 'name', 'code'
+                        ).get(pk=organization.pk)
+
+                        # Join existing organization
+                        UserOrganizationMembership.bulk_add([user], organization, role='member')
+
+                    if organization:
+                        # Set as current organization with a single-column UPDATE
+                        User.objects.filter(pk=user.pk).update(current_organization=organization)
+                        user.current_organization = organization
+            except Organization.DoesNotExist:
+                # The organization was deleted after its code was validated
+                org_join_form.add_error('organization_code', 'Invalid organization code. Please check and try again.')
+                messages.error(request, 'Please correct the errors below.')
             else:
-                if org_type == 'create':
-                    messages.success(request, f'Registration successful! Your organization code is: {organization.code}. Share this code with your team members.')
-                elif org_type == 'join':
-                    messages.success(request, f'Registration successful! You have joined {organization.name}.')
+                login(request, user)
+
+                # If there's a valid invitation, accept it
+                if invitation:
+                    invitation.accept(user)
+                    del request.session['invitation_token']
+                    messages.success(request, f'Registration successful! You have been added to {invitation.workspace.name}.')
+                    return redirect('workspaces:detail', pk=invitation.workspace.pk)
                 else:
-                    messages.success(request, 'Registration successful! Welcome to FlowBoard.')
-                return redirect('dashboard')
+                    if org_type == 'create':
+                        messages.success(request, f'Registration successful! Your organization code is: {organization.code}. Share this code with your team members.')
+                    elif org_type == 'join':
+                        messages.success(request, f'Registration successful! You have joined {organization.name}.')
+                    else:
+                        messages.success(request, 'Registration successful! Welcome to FlowBoard.')
+                    return redirect('dashboard')
         else:
             messages.error(request, 'Please correct the errors below.')
     else:
-        from .forms import OrganizationCreateForm, OrganizationJoinForm
         form = UserRegistrationForm()
+        org_create_form = None
+        org_join_form = None
+
+    # The template renders both organization forms
+    if org_create_form is None:
         org_create_form = OrganizationCreateForm()
+    if org_join_form is None:
         org_join_form = OrganizationJoinForm()
 
     context = {
@@ -147,9 +158,8 @@ def login_view(request):
 
                 # If there's an invitation token, accept it
                 if invitation_token:
-                    from workspaces.models import WorkspaceInvitation
                     try:
-                        invitation = WorkspaceInvitation.objects.get(token=invitation_token)
+                        invitation = WorkspaceInvitation.objects.select_related('workspace').get(token=invitation_token)
                         if invitation.is_valid():
                             invitation.accept(user)
                             del request.session['invitation_token']
@@ -214,34 +224,71 @@ class CustomPasswordResetCompleteView(PasswordResetCompleteView):
     template_name = 'accounts/password_reset_complete.html'
 
 
+def _get_organization_summaries(organization_ids):
+    """
+    Map of organization id to its organization and member count.
+    Cached per organization, so every member sees the same data; entries are dropped when
+    the organization or one of its memberships changes (see accounts.signals).
+    """
+    keys = {Organization.get_cache_key(organization_id): organization_id for organization_id in organization_ids}
+    cached = cache.get_many(keys)
+    summaries = {keys[key]: summary for key, summary in cached.items()}
+
+    missing = [organization_id for key, organization_id in keys.items() if key not in cached]
+    if missing:
+        # All uncached organizations with their member counts in one query
+        built = {
+            organization.pk: {'organization': organization, 'members_count': organization.members_count}
+            for organization in Organization.objects.filter(pk__in=missing).annotate(
+                members_count=Count('user_memberships')
+            )
+        }
+        cache.set_many(
+            {Organization.get_cache_key(organization_id): summary for organization_id, summary in built.items()},
+            ORGANIZATIONS_CACHE_TIMEOUT
+        )
+        summaries.update(built)
+    return summaries
+
+
 @login_required
 def organization_settings(request):
     """
     Organization settings view.
     Shows all organizations the user belongs to and their current active organization.
     """
-    # Get all organizations the user belongs to with their roles
-    user_memberships = request.user.organization_memberships.select_related('organization').all()
+    # The user's (organization id, role) pairs, cached per user; dropped when one of their memberships changes
+    memberships = cache.get_or_set(
+        UserOrganizationMembership.get_user_cache_key(request.user.pk),
+        lambda: list(request.user.organization_memberships.values_list('organization_id', 'role')),
+        ORGANIZATIONS_CACHE_TIMEOUT
+    )
+    summaries = _get_organization_summaries([organization_id for organization_id, role in memberships])
+
+    # Build organization data with roles (the current organization isn't cached, so switching needs no invalidation)
+    current_organization_id = request.user.current_organization_id
+    organizations_data = [
+        {
+            'organization': summaries[organization_id]['organization'],
+            'role': role,
+            'members_count': summaries[organization_id]['members_count'],
+            'is_owner': role == 'owner',
+            'is_current': organization_id == current_organization_id,
+        }
+        for organization_id, role in memberships
+        if organization_id in summaries
+    ]
 
     # Check if user has any organizations
-    if not user_memberships.exists():
+    if not organizations_data:
         messages.warning(request, 'You are not part of any organization.')
         return redirect('dashboard')
 
-    # Get current organization
-    current_organization = request.user.current_organization
-
-    # Build organization data with roles
-    organizations_data = []
-    for membership in user_memberships:
-        org = membership.organization
-        organizations_data.append({
-            'organization': org,
-            'role': membership.role,
-            'is_current': org == current_organization,
-            'members_count': org.user_memberships.count(),
-            'is_owner': membership.role == 'owner',
-        })
+    # Get current organization (already loaded above when the user is still a member)
+    current_organization = next(
+        (entry['organization'] for entry in organizations_data if entry['is_current']),
+        None
+    ) or request.user.current_organization
 
     context = {
         'organizations_data': organizations_data,
@@ -257,30 +304,36 @@ def join_organization(request):
     View for existing users to join an organization using a code.
     Users can join multiple organizations.
     """
-    from .forms import OrganizationJoinForm
-    from .models import UserOrganizationMembership
-
     if request.method == 'POST':
         form = OrganizationJoinForm(request.POST)
         if form.is_valid():
             organization = form.cleaned_data.get('organization')
 
             # Check if user is already a member
-            if request.user.organization_memberships.filter(organization=organization).exists():
+            if organization.id in request.user.member_org_ids:
                 messages.warning(request, f'You are already a member of {organization.name}.')
                 return redirect('accounts:organization_settings')
 
             # Add user to organization with 'member' role
-            UserOrganizationMembership.objects.create(
-                user=request.user,
-                organization=organization,
-                role='member'
-            )
+            try:
+                with transaction.atomic():
+                    UserOrganizationMembership.objects.create(
+                        user=request.user,
+                        organization=organization,
+                        role='member'
+                    )
+            except IntegrityError:
+                # Organization deleted since the form checked it, or a concurrent join got there first
+                if Organization.objects.filter(pk=organization.pk).exists():
+                    messages.warning(request, f'You are already a member of {organization.name}.')
+                    return redirect('accounts:organization_settings')
+                form.add_error('organization_code', 'Invalid organization code. Please check and try again.')
+                return render(request, 'accounts/join_organization.html', {'form': form})
 
             # Set as current organization if user has no current org
-            if not request.user.current_organization:
+            if not request.user.current_organization_id:
+                User.objects.filter(pk=request.user.pk).update(current_organization=organization)
                 request.user.current_organization = organization
-                request.user.save()
 
             messages.success(request, f'Successfully joined {organization.name}!')
             return redirect('accounts:organization_settings')
@@ -300,37 +353,37 @@ def leave_organization(request, org_id):
     View for users to leave an organization.
     Owners cannot leave their own organization.
     """
-    from .models import Organization, UserOrganizationMembership
-
     if request.method == 'POST':
-        try:
-            organization = Organization.objects.get(id=org_id)
-            membership = UserOrganizationMembership.objects.get(
-                user=request.user,
-                organization=organization
-            )
+        # Membership and organization name in one query
+        membership = UserOrganizationMembership.objects.select_related('organization').filter(
+            user=request.user,
+            organization_id=org_id
+        ).first()
 
-            # Prevent owner from leaving
-            if membership.role == 'owner':
-                messages.error(request, 'You cannot leave an organization you own. You can delete it or transfer ownership instead.')
-                return redirect('accounts:organization_settings')
+        if membership is None:
+            messages.error(request, 'Organization not found or you are not a member.')
+            return redirect('accounts:organization_settings')
 
-            org_name = organization.name
+        # Prevent owner from leaving
+        if membership.role == 'owner':
+            messages.error(request, 'You cannot leave an organization you own. You can delete it or transfer ownership instead.')
+            return redirect('accounts:organization_settings')
 
-            # Remove membership
-            membership.delete()
+        org_name = membership.organization.name
 
-            # If this was the current organization, switch to another or clear
-            if request.user.current_organization == organization:
-                # Get another organization the user belongs to
-                other_membership = request.user.organization_memberships.first()
-                request.user.current_organization = other_membership.organization if other_membership else None
-                request.user.save()
+        # Remove membership
+        membership.delete()
 
-            messages.success(request, f'You have left {org_name}.')
+        # If this was the current organization, switch to another or clear
+        if request.user.current_organization_id == membership.organization_id:
+            # Get another organization the user belongs to
+            other_org_id = UserOrganizationMembership.objects.filter(
+                user=request.user
+            ).values_list('organization_id', flat=True).first()
+            User.objects.filter(pk=request.user.pk).update(current_organization_id=other_org_id)
+            request.user.current_organization_id = other_org_id
 
-        except (Organization.DoesNotExist, UserOrganizationMembership.DoesNotExist):
-            messages.error(request, 'Organization not found or you are not a member.')
+        messages.success(request, f'You have left {org_name}.')
 
         return redirect('accounts:organization_settings')
 
@@ -343,8 +396,6 @@ def organization_members(request, org_id=None):
     View to list all members of an organization.
     Only accessible by organization owners/admins.
     """
-    from .models import Organization
-
     # Get organization (use provided org_id or current organization)
     if org_id:
         try:
@@ -365,13 +416,15 @@ def organization_members(request, org_id=None):
         messages.error(request, 'Only organization owners and admins can view the members list.')
         return redirect('accounts:organization_settings')
 
-    # Get all members with their roles
-    memberships = organization.user_memberships.select_related('user').all().order_by('-joined_at')
+    # Get all members with their roles as plain rows, streamed while the template renders
+    memberships = organization.user_memberships.order_by('-joined_at').values(
+        'role', 'joined_at', 'user_id', 'user__username', 'user__email', 'user__phone_number'
+    ).iterator(chunk_size=2000)
 
     context = {
         'organization': organization,
         'memberships': memberships,
-        'total_members': memberships.count(),
+        'total_members': organization.user_memberships.count(),
     }
 
     return render(request, 'accounts/organization_members.html', context)
@@ -383,53 +436,51 @@ def remove_organization_member(request, org_id, user_id):
     View to remove a member from the organization.
     Only accessible by organization owners/admins.
     """
-    from .models import Organization, User, UserOrganizationMembership
+    if request.method != 'POST':
+        return redirect('accounts:organization_members_detail', org_id=org_id)
 
-    try:
-        organization = Organization.objects.get(id=org_id)
-    except Organization.DoesNotExist:
-        messages.error(request, 'Organization not found.')
-        return redirect('accounts:organization_settings')
+    # Caller's role in this organization (None if not a member)
+    caller_role = UserOrganizationMembership.objects.filter(
+        user=request.user,
+        organization_id=org_id
+    ).values_list('role', flat=True).first()
 
     # Check if user is admin or owner in this organization
-    if not request.user.is_admin_in_organization(organization):
+    if caller_role not in ['admin', 'owner']:
         messages.error(request, 'Only organization owners and admins can remove members.')
         return redirect('accounts:organization_settings')
 
-    if request.method == 'POST':
-        try:
-            member = User.objects.get(id=user_id)
-            membership = UserOrganizationMembership.objects.get(
-                user=member,
-                organization=organization
-            )
-
-            # Prevent removing yourself
-            if member == request.user:
-                messages.error(request, 'You cannot remove yourself from the organization.')
-                return redirect('accounts:organization_members', org_id=org_id)
+    # Prevent removing yourself
+    if user_id == request.user.id:
+        messages.error(request, 'You cannot remove yourself from the organization.')
+        return redirect('accounts:organization_members_detail', org_id=org_id)
 
-            # Prevent non-owners from removing owners
-            if membership.role == 'owner' and request.user.get_role_in_organization(organization) != 'owner':
-                messages.error(request, 'You cannot remove an owner from the organization.')
-                return redirect('accounts:organization_members', org_id=org_id)
+    # Target membership with just the member columns used below
+    membership = UserOrganizationMembership.objects.select_related('user').only(
+        'id', 'role', 'organization_id', 'user__id', 'user__username', 'user__current_organization_id'
+    ).filter(organization_id=org_id, user_id=user_id).first()
 
-            member_username = member.username
-            membership.delete()
+    if membership is None:
+        messages.error(request, 'Member not found.')
+        return redirect('accounts:organization_members_detail', org_id=org_id)
 
-            # If the removed member had this as current org, switch them to another
-            if member.current_organization == organization:
-                other_membership = member.organization_memberships.first()
-                member.current_organization = other_membership.organization if other_membership else None
-                member.save()
+    # Prevent non-owners from removing owners
+    if membership.role == 'owner' and caller_role != 'owner':
+        messages.error(request, 'You cannot remove an owner from the organization.')
+        return redirect('accounts:organization_members_detail', org_id=org_id)
 
-            messages.success(request, f'{member_username} has been removed from the organization.')
-        except (User.DoesNotExist, UserOrganizationMembership.DoesNotExist):
-            messages.error(request, 'Member not found.')
+    member = membership.user
+    membership.delete()
 
-        return redirect('accounts:organization_members', org_id=org_id)
+    # If the removed member had this as current org, switch them to another
+    if member.current_organization_id == org_id:
+        other_org_id = UserOrganizationMembership.objects.filter(
+            user_id=member.pk
+        ).values_list('organization_id', flat=True).first()
+        User.objects.filter(pk=member.pk).update(current_organization_id=other_org_id)
 
-    return redirect('accounts:organization_members', org_id=org_id)
+    messages.success(request, f'{member.username} has been removed from the organization.')
+    return redirect('accounts:organization_members_detail', org_id=org_id)
 
 
 @login_required
@@ -437,20 +488,18 @@ def switch_organization(request, org_id):
     """
     View to switch the user's current active organization.
     """
-    from .models import Organization
-
     if request.method == 'POST':
         try:
             organization = Organization.objects.get(id=org_id)
 
             # Check if user is a member of this organization
-            if not request.user.organization_memberships.filter(organization=organization).exists():
+            if organization.id not in request.user.member_org_ids:
                 messages.error(request, 'You are not a member of this organization.')
                 return redirect('accounts:organization_settings')
 
             # Switch current organization
+            User.objects.filter(pk=request.user.pk).update(current_organization=organization)
             request.user.current_organization = organization
-            request.user.save()
 
             messages.success(request, f'Switched to {organization.name}.')
 
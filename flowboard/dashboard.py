@@ -3,12 +3,162 @@ Dashboard views for different user roles.
 """
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.views.decorators.cache import cache_page
-from django.db.models import Q, Count, Prefetch
+from django.core.cache import cache
+from django.db.models import QuerySet, Q, Count, Case, When, Value, F, Window, CharField, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
 from workspaces.models import Workspace, WorkspaceMember
-from projects.models import Project
-from tasks.models import Task
-from datetime import datetime, timedelta
+from projects.models import Project, Sprint
+from tasks.models import Task, Subtask
+from datetime import timedelta
+import hashlib
+import uuid
+
+
+# Seconds a user's dashboard context stays cached; writes in the user's workspaces make it stale sooner
+DASHBOARD_CACHE_TIMEOUT = 60 * 5
+
+
+def get_workspace_version_key(workspace_id):
+    return f'dash:ws:{workspace_id}'
+
+
+def invalidate_workspace_dashboards(workspace_ids):
+    """
+    Make the cached dashboards of everyone in the given workspaces stale.
+    Each workspace's dashboard version is replaced (one cache write per workspace,
+    whatever its member count); dashboards cached under the old versions are never
+    read again and expire on their own.
+    """
+    version = uuid.uuid4().hex
+    cache.set_many({get_workspace_version_key(workspace_id): version for workspace_id in set(workspace_ids)}, None)
+
+
+def deleted_with(origin, *models):
+    """
+    Whether a post_delete is part of a delete that started at an instance or queryset
+    of one of `models` (the signal's `origin`); such cascades invalidate once, at the top.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+def _get_dashboard_versions(user):
+    """
+    Digest of the dashboard versions of `user`'s workspaces. It changes whenever one of
+    those workspaces is written to, or the user joins or leaves a workspace.
+    """
+    workspace_ids = sorted(WorkspaceMember.get_workspace_ids(user.pk))
+    keys = [get_workspace_version_key(workspace_id) for workspace_id in workspace_ids]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Never reuse a version, even after the entry was culled from the cache
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return hashlib.md5(repr([versions[key] for key in keys]).encode()).hexdigest()
+
+
+def get_dashboard_cache_key(role, user):
+    return f'dash:{role}:{user.pk}:{_get_dashboard_versions(user)}'
+
+
+def _get_dashboard_context(role, user, build):
+    """
+    Get a dashboard context from the per-user cache, building it on a miss.
+    Keyed by role and user so one user's data is never served to another.
+    """
+    return cache.get_or_set(
+        get_dashboard_cache_key(role, user),
+        lambda: build(user),
+        DASHBOARD_CACHE_TIMEOUT
+    )
+
+
+# Columns the dashboard task and project lists render; rows are plain dicts, not model instances
+DASHBOARD_TASK_FIELDS = ['id', 'title', 'status', 'due_date', 'project__name']
+DASHBOARD_PROJECT_FIELDS = ['id', 'name', 'created_at', 'workspace__name']
+
+
+def _task_rows(tasks, *extra_fields):
+    """
+    Select the dashboard task columns as dicts, with the status label as status_display.
+    """
+    return tasks.annotate(
+        status_display=Case(
+            *[When(status=value, then=Value(label)) for value, label in Task.STATUS_CHOICES],
+            default=F('status'),
+            output_field=CharField()
+        )
+    ).values(*DASHBOARD_TASK_FIELDS, 'status_display', *extra_fields)
+
+# Above this many managed projects the PM dashboard filters by subquery instead of an id list
+PROJECT_ID_LIST_LIMIT = 1000
+
+# Projects listed on the admin and PM dashboards
+RECENT_PROJECTS_LIMIT = 5
+
+
+def _count_subquery(queryset, field):
+    """
+    Correlated COUNT of `queryset` rows whose `field` points at the outer row (0 when there are none).
+    Each count scans its own index, unlike Count(distinct=True) over several joins.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+                count=Count('*')
+            ).values('count'),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def _recent_projects(projects, limit=RECENT_PROJECTS_LIMIT, **counts):
+    """
+    Get the most recent projects with task_count (and any extra `counts` subqueries) set.
+    """
+    counts = {'task_count': _count_subquery(Task.objects, 'project'), **counts}
+    return list(
+        projects.annotate(**counts).order_by('-created_at').values(*DASHBOARD_PROJECT_FIELDS, *counts)[:limit]
+    )
+
+
+# Rows shown in each of the overdue/upcoming lists on the admin and PM dashboards
+DUE_TASKS_LIMIT = 10
+
+
+def _split_due_tasks(tasks, today, week_out, limit=DUE_TASKS_LIMIT):
+    """
+    Fetch the overdue and upcoming (due by week_out) open tasks in a single query.
+    Rows are tagged with their list and numbered within it by due date,
+    so each list is capped at `limit` without a query per list.
+    """
+    due_tasks = tasks.filter(
+        due_date__lte=week_out,
+        status__in=['todo', 'in_progress']
+    ).annotate(
+        bucket=Case(When(due_date__lt=today, then=Value('overdue')), default=Value('upcoming'))
+    ).annotate(
+        bucket_row=Window(RowNumber(), partition_by=F('bucket'), order_by=[F('due_date').asc(), F('id').asc()])
+    ).filter(bucket_row__lte=limit).order_by('due_date', 'id')
+
+    overdue_tasks = []
+    upcoming_tasks = []
+    for task in _task_rows(due_tasks, 'bucket'):
+        if task['bucket'] == 'overdue':
+            overdue_tasks.append(task)
+        else:
+            upcoming_tasks.append(task)
+    return overdue_tasks, upcoming_tasks
+
+
+def _user_workspace_roles(user):
+    """
+    Map of workspace id to `user`'s role there, from one scan of the membership table.
+    """
+    return dict(WorkspaceMember.objects.filter(user=user).values_list('workspace_id', 'role'))
 
 
 @login_required
@@ -17,16 +167,16 @@ def dashboard(request):
     Role-based dashboard that redirects to appropriate view based on user's primary role.
     Shows the dashboard for the highest role the user has across all workspaces.
     """
-    # Get user's memberships
-    memberships = WorkspaceMember.objects.filter(user=request.user).select_related('workspace')
+    # Get the user's roles across workspaces in one query; the highest one wins (admin > pm > member)
+    roles = set(_user_workspace_roles(request.user).values())
 
-    if not memberships.exists():
+    if not roles:
         # User is not part of any workspace, show empty state
         return render(request, 'dashboard/no_workspace.html')
 
     # Determine highest role
-    has_admin = memberships.filter(role='admin').exists()
-    has_pm = memberships.filter(role='pm').exists()
+    has_admin = 'admin' in roles
+    has_pm = 'pm' in roles
 
     if has_admin:
         return admin_dashboard(request)
@@ -36,38 +186,33 @@ def dashboard(request):
         return member_dashboard(request)
 
 
-@login_required
-@cache_page(60 * 5)  # Cache for 5 minutes
-def admin_dashboard(request):
-    """
-    Admin dashboard - overview of all workspaces, projects, and users.
-    Shows comprehensive statistics across all workspaces where user is admin.
-    """
-    # Get workspaces where user is admin (optimized with annotations)
+def _build_admin_dashboard(user):
+    """Build the admin dashboard context for `user`."""
+    # Date bounds computed once so every filter uses the same day
+    today = timezone.localdate()
+    week_out = today + timedelta(days=7)
+
+    # Get workspaces where user is admin (a plain id list, so the filters below are IN predicates, not joins)
+    admin_workspace_ids = [
+        workspace_id for workspace_id, role in _user_workspace_roles(user).items() if role == 'admin'
+    ]
     admin_workspaces = Workspace.objects.filter(
-        members__user=request.user,
-        members__role='admin'
-    ).annotate(
-        project_count=Count('projects', distinct=True),
-        member_count=Count('members', distinct=True)
-    ).distinct()
-
-    # Get all projects in admin workspaces (optimized with prefetch)
-    all_projects = Project.objects.filter(
-        workspace__in=admin_workspaces
-    ).select_related('workspace').prefetch_related('tasks').annotate(
-        task_count=Count('tasks', distinct=True)
+        id__in=admin_workspace_ids
+    ).only('id', 'name', 'created_at').annotate(
+        project_count=_count_subquery(Project.objects, 'workspace'),
+        member_count=_count_subquery(WorkspaceMember.objects, 'workspace')
     )
 
-    # Get all tasks in admin workspaces (optimized with select_related and prefetch_related)
+    # Get all tasks in admin workspaces (only the columns the dashboard renders)
     all_tasks = Task.objects.filter(
-        project__workspace__in=admin_workspaces
-    ).select_related('project__workspace', 'created_by', 'sprint').prefetch_related('assigned_to')
+        project__workspace_id__in=admin_workspace_ids
+    )
 
     # Calculate statistics using aggregate for better performance
-    from django.db.models import Sum
-    total_workspaces = admin_workspaces.count()
-    total_projects = all_projects.count()
+    # The workspace list is rendered in full anyway, so both totals come from its rows
+    admin_workspaces = list(admin_workspaces)
+    total_workspaces = len(admin_workspaces)
+    total_projects = sum(workspace.project_count for workspace in admin_workspaces)
 
     # Use aggregate with conditional counting (single query instead of 4 separate queries)
     task_stats = all_tasks.aggregate(
@@ -83,23 +228,13 @@ def admin_dashboard(request):
     todo_tasks = task_stats['todo']
 
     # Get recent activity (already optimized with select_related above)
-    recent_projects = all_projects.order_by('-created_at')[:5]
-    recent_tasks = all_tasks.order_by('-created_at')[:10]
-
-    # Get overdue tasks (optimized with select_related)
-    overdue_tasks = all_tasks.filter(
-        due_date__lt=datetime.now().date(),
-        status__in=['todo', 'in_progress']
-    ).select_related('project__workspace', 'created_by').order_by('due_date')[:10]
+    recent_projects = _recent_projects(Project.objects.filter(workspace_id__in=admin_workspace_ids))
+    recent_tasks = _task_rows(all_tasks.order_by('-created_at'))[:10]
 
-    # Get upcoming tasks (next 7 days, optimized with select_related)
-    upcoming_tasks = all_tasks.filter(
-        due_date__gte=datetime.now().date(),
-        due_date__lte=datetime.now().date() + timedelta(days=7),
-        status__in=['todo', 'in_progress']
-    ).select_related('project__workspace', 'created_by').order_by('due_date')[:10]
+    # Get overdue and upcoming (next 7 days) tasks in one query
+    overdue_tasks, upcoming_tasks = _split_due_tasks(all_tasks, today, week_out)
 
-    context = {
+    return {
         'role': 'admin',
         'workspaces': admin_workspaces,
         'total_workspaces': total_workspaces,
@@ -109,56 +244,69 @@ def admin_dashboard(request):
         'in_progress_tasks': in_progress_tasks,
         'todo_tasks': todo_tasks,
         'recent_projects': recent_projects,
-        'recent_tasks': recent_tasks,
+        'recent_tasks': list(recent_tasks),
         'overdue_tasks': overdue_tasks,
         'upcoming_tasks': upcoming_tasks,
     }
 
-    return render(request, 'dashboard/admin_dashboard.html', context)
-
 
 @login_required
-@cache_page(60 * 5)  # Cache for 5 minutes
-def pm_dashboard(request):
+def admin_dashboard(request):
     """
-    Project Manager dashboard - projects they manage, sprint progress, upcoming tasks.
-    Shows data from workspaces where user is PM or Admin.
+    Admin dashboard - overview of all workspaces, projects, and users.
+    Shows comprehensive statistics across all workspaces where user is admin.
     """
-    # Get workspaces where user is PM or Admin (optimized with select_related)
-    pm_workspaces = Workspace.objects.filter(
-        members__user=request.user,
-        members__role__in=['pm', 'admin']
-    ).select_related('creator').distinct()
-
-    # Get projects in these workspaces (optimized with prefetch)
-    managed_projects = Project.objects.filter(
-        workspace__in=pm_workspaces
-    ).select_related('workspace').prefetch_related('tasks', 'sprints').annotate(
-        task_count=Count('tasks', distinct=True),
-        sprint_count=Count('sprints', distinct=True)
-    ).order_by('-created_at')
+    context = _get_dashboard_context('admin', request.user, _build_admin_dashboard)
+    return render(request, 'dashboard/admin_dashboard.html', context)
 
-    # Get all tasks in managed projects (optimized with select_related)
+
+def _build_pm_dashboard(user):
+    """Build the PM dashboard context for `user`."""
+    # Date bounds computed once so every filter uses the same day
+    today = timezone.localdate()
+    week_out = today + timedelta(days=7)
+
+    # Get workspaces where user is PM or Admin
+    pm_workspace_ids = [
+        workspace_id for workspace_id, role in _user_workspace_roles(user).items() if role in ['pm', 'admin']
+    ]
+
+    # Get projects in these workspaces, materialized once as ids for the filters below
+    managed_projects = Project.objects.filter(workspace_id__in=pm_workspace_ids)
+    project_ids = list(managed_projects.values_list('id', flat=True))
+    total_projects = len(project_ids)
+    if total_projects > PROJECT_ID_LIST_LIMIT:
+        # Too many ids for a literal IN list; filter through the subquery instead
+        project_ids = managed_projects.values('id')
+
+    # Get all tasks in managed projects (only the columns the dashboard renders)
     all_tasks = Task.objects.filter(
-        project__in=managed_projects
-    ).select_related('project__workspace', 'sprint', 'created_by').prefetch_related('assigned_to')
+        project_id__in=project_ids
+    )
 
-    # Get active sprints (optimized with prefetch to avoid N+1)
-    from projects.models import Sprint
-    active_sprints = Sprint.objects.filter(
-        project__in=managed_projects,
+    # Get active sprints
+    active_sprints = list(Sprint.objects.filter(
+        project_id__in=project_ids,
         status='active'
-    ).select_related('project').prefetch_related(
-        Prefetch('tasks', queryset=Task.objects.select_related('project'))
-    ).order_by('end_date')
+    ).select_related('project').order_by('end_date'))
+
+    # Task totals for all active sprints in one GROUP BY query
+    sprint_progress = {
+        row['sprint']: row
+        for row in Task.objects.filter(
+            sprint_id__in=[sprint.id for sprint in active_sprints]
+        ).order_by().values('sprint').annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='done'))
+        )
+    }
 
-    # Calculate sprint progress for each active sprint (optimized - no N+1 queries)
+    # Calculate sprint progress for each active sprint
     sprint_data = []
     for sprint in active_sprints:
-        # Tasks are prefetched, no additional query
-        sprint_tasks = sprint.tasks.all()
-        total = len([t for t in sprint_tasks])
-        completed = len([t for t in sprint_tasks if t.status == 'done'])
+        row = sprint_progress.get(sprint.id, {})
+        total = row.get('total', 0)
+        completed = row.get('completed', 0)
         progress = int((completed / total) * 100) if total > 0 else 0
         sprint_data.append({
             'sprint': sprint,
@@ -167,9 +315,13 @@ def pm_dashboard(request):
             'progress': progress,
         })
 
-    # Statistics (optimized with aggregate)
-    total_projects = managed_projects.count()
+    # Most recent projects with task and sprint counts for just those projects
+    recent_managed_projects = _recent_projects(
+        managed_projects,
+        sprint_count=_count_subquery(Sprint.objects, 'project')
+    )
 
+    # Statistics (optimized with aggregate)
     task_stats = all_tasks.aggregate(
         total=Count('id'),
         completed=Count('id', filter=Q(status='done')),
@@ -180,26 +332,15 @@ def pm_dashboard(request):
     completed_tasks = task_stats['completed']
     in_progress_tasks = task_stats['in_progress']
 
-    # Get overdue tasks (already optimized with select_related above)
-    overdue_tasks = all_tasks.filter(
-        due_date__lt=datetime.now().date(),
-        status__in=['todo', 'in_progress']
-    ).order_by('due_date')[:10]
-
-    # Get upcoming tasks (next 7 days, already optimized)
-    upcoming_tasks = all_tasks.filter(
-        due_date__gte=datetime.now().date(),
-        due_date__lte=datetime.now().date() + timedelta(days=7),
-        status__in=['todo', 'in_progress']
-    ).order_by('due_date')[:10]
+    # Get overdue and upcoming (next 7 days) tasks in one query
+    overdue_tasks, upcoming_tasks = _split_due_tasks(all_tasks, today, week_out)
 
     # Recent activity (already optimized)
-    recent_tasks = all_tasks.order_by('-created_at')[:10]
+    recent_tasks = _task_rows(all_tasks.order_by('-created_at'))[:10]
 
-    context = {
+    return {
         'role': 'pm',
-        'workspaces': pm_workspaces,
-        'managed_projects': managed_projects[:5],  # Show top 5 on dashboard
+        'managed_projects': recent_managed_projects,  # Show top 5 on dashboard
         'total_projects': total_projects,
         'total_tasks': total_tasks,
         'completed_tasks': completed_tasks,
@@ -207,54 +348,57 @@ def pm_dashboard(request):
         'sprint_data': sprint_data,
         'overdue_tasks': overdue_tasks,
         'upcoming_tasks': upcoming_tasks,
-        'recent_tasks': recent_tasks,
+        'recent_tasks': list(recent_tasks),
     }
 
-    return render(request, 'dashboard/pm_dashboard.html', context)
-
 
 @login_required
-@cache_page(60 * 5)  # Cache for 5 minutes
-def member_dashboard(request):
+def pm_dashboard(request):
     """
-    Member dashboard - tasks assigned to them, completion percentage, due dates.
-    Shows only tasks assigned to the user.
+    Project Manager dashboard - projects they manage, sprint progress, upcoming tasks.
+    Shows data from workspaces where user is PM or Admin.
     """
-    # Get workspaces where user is a member
-    user_workspaces = Workspace.objects.filter(
-        members__user=request.user
-    ).distinct()
+    context = _get_dashboard_context('pm', request.user, _build_pm_dashboard)
+    return render(request, 'dashboard/pm_dashboard.html', context)
+
+
+def _build_member_dashboard(user):
+    """Build the member dashboard context for `user`."""
+    # Date bounds computed once so every filter uses the same day
+    today = timezone.localdate()
+    week_out = today + timedelta(days=7)
 
-    # Get tasks assigned to the user (optimized with select_related)
+    # Get tasks assigned to the user (only the columns the dashboard renders)
     assigned_tasks = Task.objects.filter(
-        assigned_to=request.user
-    ).select_related('project__workspace', 'sprint', 'created_by').order_by('-created_at')
+        assigned_to=user
+    ).order_by('-created_at')
 
-    # Get subtasks assigned to the user (optimized with select_related)
-    from tasks.models import Subtask
-    assigned_subtasks = Subtask.objects.filter(
-        assigned_to=request.user
-    ).select_related('task__project__workspace', 'created_by')
+    # Calculate statistics (single query instead of 4 separate queries)
+    task_stats = assigned_tasks.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='done')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        todo=Count('id', filter=Q(status='todo'))
+    )
 
-    # Calculate statistics
-    total_tasks = assigned_tasks.count()
-    completed_tasks = assigned_tasks.filter(status='done').count()
-    in_progress_tasks = assigned_tasks.filter(status='in_progress').count()
-    todo_tasks = assigned_tasks.filter(status='todo').count()
+    total_tasks = task_stats['total']
+    completed_tasks = task_stats['completed']
+    in_progress_tasks = task_stats['in_progress']
+    todo_tasks = task_stats['todo']
 
     # Calculate completion percentage
     completion_percentage = int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0
 
     # Get overdue tasks
     overdue_tasks = assigned_tasks.filter(
-        due_date__lt=datetime.now().date(),
+        due_date__lt=today,
         status__in=['todo', 'in_progress']
     ).order_by('due_date')
 
     # Get upcoming tasks (next 7 days)
     upcoming_tasks = assigned_tasks.filter(
-        due_date__gte=datetime.now().date(),
-        due_date__lte=datetime.now().date() + timedelta(days=7),
+        due_date__gte=today,
+        due_date__lte=week_out,
         status__in=['todo', 'in_progress']
     ).order_by('due_date')
 
@@ -263,25 +407,37 @@ def member_dashboard(request):
     tasks_todo = assigned_tasks.filter(status='todo')[:5]
     tasks_completed = assigned_tasks.filter(status='done')[:5]
 
-    # Subtask statistics
-    total_subtasks = assigned_subtasks.count()
-    completed_subtasks = assigned_subtasks.filter(status='done').count()
+    # Subtask statistics (only counts are shown, so no subtask rows are loaded)
+    subtask_stats = Subtask.objects.filter(assigned_to=user).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='done'))
+    )
+
+    total_subtasks = subtask_stats['total']
+    completed_subtasks = subtask_stats['completed']
 
-    context = {
+    return {
         'role': 'member',
-        'workspaces': user_workspaces,
         'total_tasks': total_tasks,
         'completed_tasks': completed_tasks,
         'in_progress_tasks': in_progress_tasks,
         'todo_tasks': todo_tasks,
         'completion_percentage': completion_percentage,
-        'overdue_tasks': overdue_tasks,
-        'upcoming_tasks': upcoming_tasks,
-        'tasks_in_progress': tasks_in_progress,
-        'tasks_todo': tasks_todo,
-        'tasks_completed': tasks_completed,
+        'overdue_tasks': list(_task_rows(overdue_tasks)),
+        'upcoming_tasks': list(_task_rows(upcoming_tasks)),
+        'tasks_in_progress': list(_task_rows(tasks_in_progress)),
+        'tasks_todo': list(_task_rows(tasks_todo)),
+        'tasks_completed': list(_task_rows(tasks_completed)),
         'total_subtasks': total_subtasks,
         'completed_subtasks': completed_subtasks,
     }
 
+
+@login_required
+def member_dashboard(request):
+    """
+    Member dashboard - tasks assigned to them, completion percentage, due dates.
+    Shows only tasks assigned to the user.
+    """
+    context = _get_dashboard_context('member', request.user, _build_member_dashboard)
     return render(request, 'dashboard/member_dashboard.html', context)
@@ -1,6 +1,8 @@
 """
 Custom middleware for debugging and logging.
 """
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,28 +12,26 @@ class AuthenticationDebugMiddleware:
     """
     Middleware to debug authentication and session issues.
     Enable this temporarily to diagnose login/logout problems.
+    Only active when DEBUG is on; output goes to the flowboard.middleware logger at DEBUG level.
     """
     def __init__(self, get_response):
+        if not settings.DEBUG:
+            # Remove this middleware from the chain entirely
+            raise MiddlewareNotUsed
         self.get_response = get_response
 
     def __call__(self, request):
-        # Log authentication status before processing
-        if request.path not in ['/static/', '/media/']:  # Skip static files
-            logger.debug(f"[AUTH DEBUG] Path: {request.path}")
-            logger.debug(f"[AUTH DEBUG] User: {request.user}")
-            logger.debug(f"[AUTH DEBUG] Is Authenticated: {request.user.is_authenticated}")
-            logger.debug(f"[AUTH DEBUG] Session Key: {request.session.session_key}")
-            logger.debug(f"[AUTH DEBUG] Session Data: {dict(request.session)}")
-
-            # Print to console for immediate debugging
-            print(f"\n=== AUTH DEBUG ===")
-            print(f"Path: {request.path}")
-            print(f"Method: {request.method}")
-            print(f"User: {request.user}")
-            print(f"Authenticated: {request.user.is_authenticated}")
-            print(f"Session Key: {request.session.session_key}")
-            print(f"Cookies: {request.COOKIES.keys()}")
-            print(f"==================\n")
+        # Log authentication status before processing (lazy %-args so nothing is formatted unless enabled)
+        if logger.isEnabledFor(logging.DEBUG) and not request.path.startswith(('/static/', '/media/')):
+            logger.debug(
+                "[AUTH DEBUG] path=%s method=%s user=%s authenticated=%s session_key=%s cookies=%s",
+                request.path,
+                request.method,
+                request.user,
+                request.user.is_authenticated,
+                request.session.session_key,
+                list(request.COOKIES.keys())
+            )
 
         response = self.get_response(request)
         return response
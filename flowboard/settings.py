@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 from dotenv import load_dotenv
 
@@ -63,6 +64,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# N+1 query detection during development, when nplusone is installed (pip install nplusone)
+if DEBUG and importlib.util.find_spec('nplusone'):
+    INSTALLED_APPS.append('nplusone.ext.django')
+    MIDDLEWARE.insert(0, 'nplusone.ext.django.NPlusOneMiddleware')
+    # Log N+1 queries by default; set NPLUSONE_RAISE=True to make them raise (e.g. in CI)
+    NPLUSONE_RAISE = os.getenv('NPLUSONE_RAISE', 'False') == 'True'
+
 ROOT_URLCONF = 'flowboard.urls'
 
 TEMPLATES = [
@@ -219,6 +227,7 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', '')
 # SMS Configuration (Mnotify API)
 MNOTIFY_API_KEY = os.getenv('MNOTIFY_API_KEY', '')
 MNOTIFY_SENDER = os.getenv('MNOTIFY_SENDER', 'FlowBoard')
+MNOTIFY_MAX_CONCURRENCY = int(os.getenv('MNOTIFY_MAX_CONCURRENCY', '8'))  # In-flight SMS requests per process
 
 # Background Task Configuration
 BACKGROUND_TASK_RUN_ASYNC = True  # Run tasks asynchronously
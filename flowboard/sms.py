@@ -0,0 +1,220 @@
+"""
+Shared HTTP client, circuit breaker and bulkhead for the Mnotify SMS API.
+"""
+from datetime import timedelta
+from django.conf import settings
+import atexit
+import importlib.util
+import logging
+import os
+import random
+import threading
+import time
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+# Kept-alive connections to api.mnotify.com shared by the worker's threads
+SMS_MAX_KEEPALIVE_CONNECTIONS = 20
+SMS_MAX_CONNECTIONS = 40
+
+# Delays between deferred SMS retries while Mnotify is unavailable (see sms_retry_delay)
+SMS_RETRY_BASE_DELAY = 60
+SMS_RETRY_MAX_DELAY = 60 * 30
+SMS_MAX_DEFERRALS = 5
+
+# Seconds to wait for a free bulkhead slot before deferring the SMS instead
+SMS_BULKHEAD_TIMEOUT = 5
+
+MNOTIFY_SMS_URL = 'https://api.mnotify.com/api/sms/quick'
+_MNOTIFY_HEADERS = {"Content-Type": "application/json"}
+# Payload fields that are the same for every message
+_MNOTIFY_PAYLOAD_BASE = {"is_schedule": False, "schedule_date": ""}
+
+_client = None
+_client_lock = threading.Lock()
+_bulkhead = None
+
+
+def get_sms_client():
+    """
+    The process-wide httpx client for SMS requests, created on first use.
+    Reusing it keeps the TCP connection and TLS session to Mnotify alive between
+    messages instead of handshaking for every SMS. HTTP/2 is used when h2 is installed.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    timeout=30.0,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=SMS_MAX_KEEPALIVE_CONNECTIONS,
+                        max_connections=SMS_MAX_CONNECTIONS
+                    ),
+                    http2=importlib.util.find_spec('h2') is not None
+                )
+    return _client
+
+
+def close_sms_client():
+    """Close the shared client; the next get_sms_client() opens a new one."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _get_bulkhead():
+    """Semaphore bounding in-flight Mnotify requests to settings.MNOTIFY_MAX_CONCURRENCY."""
+    global _bulkhead
+    if _bulkhead is None:
+        with _client_lock:
+            if _bulkhead is None:
+                _bulkhead = threading.BoundedSemaphore(getattr(settings, 'MNOTIFY_MAX_CONCURRENCY', 8))
+    return _bulkhead
+
+
+def _reset_after_fork():
+    # A forked worker must not share the parent's sockets, so it starts without a client
+    global _client, _client_lock, _bulkhead
+    _client = None
+    _client_lock = threading.Lock()
+    _bulkhead = None
+
+
+atexit.register(close_sms_client)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class SMSUnavailableError(Exception):
+    """Raised instead of sending an SMS that should be retried later."""
+
+
+class CircuitOpenError(SMSUnavailableError):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+
+class BulkheadFullError(SMSUnavailableError):
+    """Raised when too many SMS requests are already in flight."""
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing provider for a while.
+    After `failure_threshold` consecutive failures the circuit opens and calls fail
+    straight away with CircuitOpenError. Once `recovery_timeout` seconds have passed a
+    single trial call goes through (half-open): success closes the circuit, failure
+    opens it again. State is kept per process.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def retry_after(self):
+        """Seconds until an open circuit lets a trial call through (0 when not open)."""
+        if self.state != self.OPEN:
+            return 0
+        return max(0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self.state == self.OPEN and self.retry_after() == 0:
+                self.state = self.HALF_OPEN
+                return
+            if self.state != self.CLOSED:
+                # Open, or half-open with the trial call already in flight
+                raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"{self.name} circuit opened after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+mnotify_breaker = CircuitBreaker('mnotify', failure_threshold=5, recovery_timeout=60)
+
+
+def post_sms(phone_numbers, message):
+    """
+    Send `message` to `phone_numbers` in one Mnotify request on the shared client,
+    through the bulkhead and mnotify_breaker. Transport errors and non-200 responses
+    count as failures; the response is returned either way. Raises SMSUnavailableError
+    (CircuitOpenError or BulkheadFullError) when the request should be retried later.
+    """
+    url = f"{MNOTIFY_SMS_URL}?key={getattr(settings, 'MNOTIFY_API_KEY', '')}"
+    payload = {
+        **_MNOTIFY_PAYLOAD_BASE,
+        "recipient": list(phone_numbers),
+        "sender": getattr(settings, 'MNOTIFY_SENDER', 'FlowBoard'),
+        "message": message,
+    }
+
+    bulkhead = _get_bulkhead()
+    if not bulkhead.acquire(timeout=SMS_BULKHEAD_TIMEOUT):
+        raise BulkheadFullError(f"{getattr(settings, 'MNOTIFY_MAX_CONCURRENCY', 8)} SMS requests already in flight")
+    try:
+        # Checked only once a slot is held, so a half-open trial call is never abandoned
+        mnotify_breaker.before_call()
+        try:
+            response = get_sms_client().post(url, json=payload, headers=_MNOTIFY_HEADERS)
+        except Exception:
+            mnotify_breaker.record_failure()
+            raise
+    finally:
+        bulkhead.release()
+
+    if response.status_code == 200:
+        mnotify_breaker.record_success()
+    else:
+        mnotify_breaker.record_failure()
+    return response
+
+
+def sms_retry_delay(attempt):
+    """
+    Delay before deferred SMS retry number `attempt` (0-based): exponential backoff
+    capped at SMS_RETRY_MAX_DELAY, with jitter so deferred jobs don't retry in step.
+    Never shorter than the time left before the circuit lets a call through.
+    """
+    seconds = min(
+        SMS_RETRY_MAX_DELAY,
+        SMS_RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, SMS_RETRY_BASE_DELAY)
+    )
+    return timedelta(seconds=max(seconds, mnotify_breaker.retry_after()))
+
+
+def defer_sms_job(job, deferrals, *args):
+    """
+    Queue the SMS background `job` again with `args` after sms_retry_delay(), instead of
+    failing it while Mnotify is unavailable. Gives up after SMS_MAX_DEFERRALS.
+    """
+    if deferrals >= SMS_MAX_DEFERRALS:
+        logger.error(f"Mnotify still unavailable, dropping SMS job {job.name}{args}")
+        return
+    delay = sms_retry_delay(deferrals)
+    job(*args, deferrals=deferrals + 1, schedule=delay)
+    logger.warning(f"Mnotify unavailable, SMS job {job.name}{args} deferred by {delay}")
@@ -0,0 +1,254 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from accounts.models import User
+from projects.models import Project
+from tasks.models import Task
+from tasks.tasks import send_task_assignment_sms_async
+from workspaces.models import Workspace, WorkspaceMember
+from .dashboard import _get_dashboard_context
+from .paginator import LargeTablePaginator
+from . import sms
+from .sms import BulkheadFullError, CircuitBreaker, CircuitOpenError, post_sms
+
+
+class DashboardCacheTests(TestCase):
+    """Cached dashboards go stale when anything they show changes in the user's workspaces."""
+
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+        self.user = User.objects.create_user('admin', 'admin@example.com', 'pw')
+        self.workspace = Workspace.objects.create(name='Workspace', created_by=self.user)
+        self.membership = WorkspaceMember.objects.create(workspace=self.workspace, user=self.user, role='admin')
+        self.project = Project.objects.create(workspace=self.workspace, name='Project', created_by=self.user)
+
+    def build(self, user):
+        self.builds += 1
+        return {'build': self.builds}
+
+    def dashboard(self):
+        return _get_dashboard_context('admin', self.user, self.build)['build']
+
+    def assertRebuiltAfter(self, change):
+        before = self.dashboard()
+        self.assertEqual(self.dashboard(), before)
+        change()
+        self.assertEqual(self.dashboard(), before + 1)
+
+    def test_task_change(self):
+        self.assertRebuiltAfter(lambda: Task.objects.create(project=self.project, title='Task', created_by=self.user))
+
+    def test_project_create_rename_delete(self):
+        self.assertRebuiltAfter(lambda: Project.objects.create(workspace=self.workspace, name='Other', created_by=self.user))
+
+        def rename():
+            self.project.name = 'Renamed'
+            self.project.save()
+        self.assertRebuiltAfter(rename)
+        self.assertRebuiltAfter(self.project.delete)
+
+    def test_member_role_change_and_join(self):
+        def change_role():
+            self.membership.role = 'pm'
+            self.membership.save()
+        self.assertRebuiltAfter(change_role)
+
+        other = User.objects.create_user('member', 'member@example.com', 'pw')
+        self.assertRebuiltAfter(lambda: WorkspaceMember.objects.create(workspace=self.workspace, user=other))
+
+    def test_workspace_create_and_rename(self):
+        def join_new_workspace():
+            workspace = Workspace.objects.create(name='Second', created_by=self.user)
+            WorkspaceMember.objects.create(workspace=workspace, user=self.user, role='admin')
+        self.assertRebuiltAfter(join_new_workspace)
+
+        def rename():
+            self.workspace.name = 'Renamed'
+            self.workspace.save()
+        self.assertRebuiltAfter(rename)
+
+    def test_other_workspace_writes_keep_cache(self):
+        other_user = User.objects.create_user('other', 'other@example.com', 'pw')
+        other_workspace = Workspace.objects.create(name='Other', created_by=other_user)
+        other_project = Project.objects.create(workspace=other_workspace, name='Other', created_by=other_user)
+        before = self.dashboard()
+        Task.objects.create(project=other_project, title='Task', created_by=other_user)
+        self.assertEqual(self.dashboard(), before)
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """CircuitBreaker opens after repeated failures and lets one trial call through after the cooldown."""
+
+    def setUp(self):
+        self.now = 1000.0
+        for patcher in (
+            mock.patch('flowboard.sms.time.monotonic', lambda: self.now),
+            mock.patch.object(sms, 'logger'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test', failure_threshold=5, recovery_timeout=60)
+
+    def fail(self, times):
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold_failures(self):
+        self.fail(4)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.fail(1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.assertEqual(self.breaker.retry_after(), 60)
+
+    def test_success_resets_failure_count(self):
+        self.fail(4)
+        self.breaker.record_success()
+        self.fail(4)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_after_cooldown_allows_one_trial(self):
+        self.fail(5)
+        self.now += 59
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+        self.now += 1
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        # Only the trial call goes through until it reports back
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_trial_success_closes(self):
+        self.fail(5)
+        self.now += 60
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.retry_after(), 0)
+        self.breaker.before_call()
+
+    def test_trial_failure_reopens(self):
+        self.fail(5)
+        self.now += 60
+        self.fail(1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.retry_after(), 60)
+
+    def test_post_sms_counts_error_responses(self):
+        client = mock.Mock()
+        client.post.return_value = mock.Mock(status_code=500)
+        with mock.patch('flowboard.sms.mnotify_breaker', self.breaker), \
+                mock.patch('flowboard.sms.get_sms_client', return_value=client):
+            for _ in range(5):
+                post_sms(['0240000000'], 'Hello')
+            with self.assertRaises(CircuitOpenError):
+                post_sms(['0240000000'], 'Hello')
+        self.assertEqual(client.post.call_count, 5)
+
+
+@override_settings(MNOTIFY_API_KEY='key', MNOTIFY_MAX_CONCURRENCY=1)
+class BulkheadTests(TestCase):
+    """A saturated bulkhead defers the SMS job instead of failing it."""
+
+    def setUp(self):
+        self.client_post = mock.Mock(return_value=mock.Mock(status_code=200, json=dict))
+        for patcher in (
+            mock.patch.object(sms, '_bulkhead', None),
+            mock.patch.object(sms, 'SMS_BULKHEAD_TIMEOUT', 0.01),
+            mock.patch.object(sms, 'mnotify_breaker', CircuitBreaker('test')),
+            mock.patch.object(sms, 'get_sms_client', return_value=mock.Mock(post=self.client_post)),
+            mock.patch.object(sms, 'logger'),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def hold_only_slot(self):
+        bulkhead = sms._get_bulkhead()
+        self.assertTrue(bulkhead.acquire(blocking=False))
+        self.addCleanup(bulkhead.release)
+
+    def test_post_sms_times_out_when_full(self):
+        self.hold_only_slot()
+        with self.assertRaises(BulkheadFullError):
+            post_sms(['0240000000'], 'Hello')
+        self.client_post.assert_not_called()
+        # Waiting for a slot is not a provider failure
+        self.assertEqual(sms.mnotify_breaker.failures, 0)
+
+    def test_slot_is_released_after_each_request(self):
+        post_sms(['0240000000'], 'Hello')
+        post_sms(['0240000000'], 'Hello')
+        self.assertEqual(self.client_post.call_count, 2)
+
+    def test_full_bulkhead_defers_job(self):
+        user = User.objects.create_user('member', 'member@example.com', 'pw', phone_number='0240000000')
+        workspace = Workspace.objects.create(name='Workspace', created_by=user)
+        project = Project.objects.create(workspace=workspace, name='Project', created_by=user)
+        task = Task.objects.create(project=project, title='Task', created_by=user)
+        self.hold_only_slot()
+        with mock.patch('tasks.tasks.defer_sms_job') as defer:
+            send_task_assignment_sms_async.now(user.pk, task.pk, deferrals=2)
+        defer.assert_called_once_with(send_task_assignment_sms_async, 2, user.pk, task.pk)
+
+    def test_defer_reschedules_with_next_deferral(self):
+        job = mock.Mock()
+        job.name = 'job'
+        sms.defer_sms_job(job, 2, 'a')
+        args, kwargs = job.call_args
+        self.assertEqual((args, kwargs['deferrals']), (('a',), 3))
+        self.assertGreaterEqual(kwargs['schedule'].total_seconds(), sms.SMS_RETRY_BASE_DELAY * 4)
+
+    def test_defer_gives_up_after_max_deferrals(self):
+        job = mock.Mock()
+        job.name = 'job'
+        sms.defer_sms_job(job, sms.SMS_MAX_DEFERRALS, 'a')
+        job.assert_not_called()
+        sms.logger.error.assert_called_once()
+
+
+class LargeTablePaginatorTests(TestCase):
+    """LargeTablePaginator only estimates unfiltered, large PostgreSQL tables."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.workspaces = Workspace.objects.bulk_create(
+            [Workspace(name=f'Workspace {i}', created_by=self.user) for i in range(3)]
+        )
+
+    def postgres(self, estimate):
+        """Stand-in for connections[...] on PostgreSQL, with pg_class.reltuples = estimate."""
+        connection = mock.MagicMock(vendor='postgresql')
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (estimate,)
+        return mock.patch('flowboard.paginator.connections', {'default': connection}), cursor
+
+    def count(self, object_list):
+        return LargeTablePaginator(object_list, 2).count
+
+    def test_sqlite_counts_exactly(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.count(Workspace.objects.all()), 3)
+
+    def test_filtered_queryset_counts_exactly(self):
+        patcher, cursor = self.postgres(50000)
+        with patcher:
+            self.assertEqual(self.count(Workspace.objects.filter(name='Workspace 1')), 1)
+        cursor.execute.assert_not_called()
+
+    def test_small_table_estimate_counts_exactly(self):
+        patcher, cursor = self.postgres(LargeTablePaginator.EXACT_COUNT_THRESHOLD - 1)
+        with patcher:
+            self.assertEqual(self.count(Workspace.objects.all()), 3)
+        cursor.execute.assert_called_once()
+
+    def test_large_unfiltered_table_uses_estimate(self):
+        patcher, cursor = self.postgres(50000)
+        with patcher:
+            self.assertEqual(self.count(Workspace.objects.all()), 50000)
+
+    def test_lists_count_by_length(self):
+        self.assertEqual(self.count(list(range(7))), 7)
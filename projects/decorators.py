@@ -5,6 +5,26 @@ from .models import Project
 from workspaces.models import WorkspaceMember
 
 
+def _get_project_membership(request, project_id):
+    """
+    Get the project and the user's membership in its workspace (None if not a member).
+    Memoized on the request, so stacked or repeated checks for the same project don't re-query.
+    """
+    memo = getattr(request, '_project_membership_cache', None)
+    if memo is None:
+        memo = request._project_membership_cache = {}
+
+    key = (str(project_id), request.user.pk)
+    if key not in memo:
+        project = get_object_or_404(Project.objects.select_related('workspace'), pk=project_id)
+        # (workspace, user) is unique; clearing Meta.ordering keeps first() from joining workspaces to sort
+        membership = WorkspaceMember.objects.only(
+            'id', 'role', 'workspace_id', 'user_id'
+        ).filter(workspace_id=project.workspace_id, user=request.user).order_by().first()
+        memo[key] = (project, membership)
+    return memo[key]
+
+
 def project_member_required(allowed_roles=None):
     """
     Decorator to check if user is a member of the project's workspace.
@@ -14,33 +34,28 @@ def project_member_required(allowed_roles=None):
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
-            # Support both 'pk' and 'project_pk' parameter names
-            project_id = kwargs.get('pk') or kwargs.get('project_pk')
+            # Support both 'pk' and 'project_pk' parameter names (nested routes use 'pk' for the child object)
+            project_id = kwargs.get('project_pk') or kwargs.get('pk')
 
             if not project_id:
                 messages.error(request, 'Invalid project ID.')
                 return redirect('workspaces:list')
 
-            project = get_object_or_404(Project.objects.select_related('workspace'), pk=project_id)
-            try:
-                membership = WorkspaceMember.objects.get(
-                    workspace=project.workspace,
-                    user=request.user
-                )
+            project, membership = _get_project_membership(request, project_id)
+            if membership is None:
+                messages.error(request, 'You are not a member of this project\'s workspace.')
+                return redirect('workspaces:list')
 
-                # Check if role is allowed
-                if allowed_roles and membership.role not in allowed_roles:
-                    messages.error(request, 'You do not have permission to perform this action.')
-                    return redirect('projects:detail', pk=project_id)
+            # Check if role is allowed
+            if allowed_roles and membership.role not in allowed_roles:
+                messages.error(request, 'You do not have permission to perform this action.')
+                return redirect('projects:detail', pk=project_id)
 
-                # Add membership and project to request for easy access in views
-                request.workspace_membership = membership
-                request.project = project
+            # Add membership and project to request for easy access in views
+            request.workspace_membership = membership
+            request.project = project
 
-                return view_func(request, *args, **kwargs)
-            except WorkspaceMember.DoesNotExist:
-                messages.error(request, 'You are not a member of this project\'s workspace.')
-                return redirect('workspaces:list')
+            return view_func(request, *args, **kwargs)
 
         return wrapper
     return decorator
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_sprint_status'),
+        ('workspaces', '0006_workspacemember_user_role_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['workspace', 'created_at'], name='projects_workspa_e53ea7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(fields=['project', 'status'], name='sprints_project_d1ab01_idx'),
+        ),
+    ]
@@ -20,6 +20,9 @@ class Project(models.Model):
     class Meta:
         db_table = 'projects'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['workspace', 'created_at']),
+        ]
 
 
 class Sprint(models.Model):
@@ -46,4 +49,7 @@ class Sprint(models.Model):
     
     class Meta:
         db_table = 'sprints'
-        ordering = ['start_date']
\ No newline at end of file
+        ordering = ['start_date']
+        indexes = [
+            models.Index(fields=['project', 'status']),
+        ]
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Signal handlers for dashboard cache invalidation on project changes.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from flowboard.dashboard import deleted_with, invalidate_workspace_dashboards
+from workspaces.models import Workspace
+from .models import Project
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_dashboard_invalidation(sender, instance, origin=None, **kwargs):
+    """
+    Make the workspace's cached dashboards stale when a project is created, renamed or deleted.
+    """
+    if origin is not None and deleted_with(origin, Workspace):
+        return
+
+    invalidate_workspace_dashboards([instance.workspace_id])
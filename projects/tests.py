@@ -1,3 +1,88 @@
+from datetime import date
+from django.contrib.messages import get_messages
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from accounts.models import User
+from workspaces.models import Workspace, WorkspaceMember
+from .models import Project, Sprint
 
-# Create your tests here.
+
+class ProjectCreatePermissionTests(TestCase):
+    """Only admins and PMs create projects; everyone else is told why."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        self.workspace = Workspace.objects.create(name='Workspace', created_by=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role='admin')
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role='member')
+
+    def create(self, workspace):
+        return self.client.post(reverse('projects:create'), {'workspace': workspace.pk, 'name': 'Project'})
+
+    def messages(self, response):
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_admin_creates_project(self):
+        self.client.force_login(self.owner)
+        response = self.create(self.workspace)
+        project = Project.objects.get()
+        self.assertRedirects(response, reverse('projects:detail', args=[project.pk]), fetch_redirect_response=False)
+
+    def test_member_without_admin_or_pm_workspace_is_redirected(self):
+        self.client.force_login(self.member)
+        for response in (self.client.get(reverse('projects:create')), self.create(self.workspace)):
+            self.assertRedirects(response, reverse('workspaces:list'), fetch_redirect_response=False)
+            self.assertIn('You do not have permission to create projects in any workspace.', self.messages(response))
+        self.assertFalse(Project.objects.exists())
+
+    def test_pm_elsewhere_is_told_about_member_workspace(self):
+        other = Workspace.objects.create(name='Other', created_by=self.owner)
+        WorkspaceMember.objects.create(workspace=other, user=self.member, role='pm')
+        self.client.force_login(self.member)
+        response = self.create(self.workspace)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.messages(response), ['You do not have permission to create projects in this workspace.'])
+        self.assertFalse(Project.objects.exists())
+
+
+class SprintPermissionTests(TestCase):
+    """Sprint views check the project in the URL, never a project that shares the sprint's pk."""
+
+    def setUp(self):
+        cache.clear()
+        self.pm = User.objects.create_user('pm', 'pm@example.com', 'pw')
+        self.outsider = User.objects.create_user('outsider', 'outsider@example.com', 'pw')
+        workspace_a = Workspace.objects.create(name='A', created_by=self.pm)
+        workspace_b = Workspace.objects.create(name='B', created_by=self.outsider)
+        WorkspaceMember.objects.create(workspace=workspace_a, user=self.pm, role='pm')
+        WorkspaceMember.objects.create(workspace=workspace_b, user=self.outsider, role='admin')
+        self.project_a = Project.objects.create(workspace=workspace_a, name='A', created_by=self.pm)
+        self.project_b = Project.objects.create(workspace=workspace_b, name='B', created_by=self.outsider)
+        # Project B's sprint has the same pk as project A, which the PM manages
+        self.sprint_b = Sprint.objects.create(
+            pk=self.project_a.pk, project=self.project_b, name='Sprint',
+            start_date=date(2026, 1, 1), end_date=date(2026, 1, 14)
+        )
+        self.client.force_login(self.pm)
+
+    def edit(self, project):
+        return self.client.post(
+            reverse('projects:sprint_edit', args=[project.pk, self.sprint_b.pk]),
+            {'name': 'Hijacked', 'start_date': '2026-01-01', 'end_date': '2026-01-14', 'status': 'active'}
+        )
+
+    def test_sprint_of_other_project_under_own_project_is_404(self):
+        self.assertEqual(self.edit(self.project_a).status_code, 404)
+
+    def test_sprint_of_other_workspace_is_refused(self):
+        self.assertRedirects(self.edit(self.project_b), reverse('workspaces:list'), fetch_redirect_response=False)
+        self.sprint_b.refresh_from_db()
+        self.assertEqual(self.sprint_b.name, 'Sprint')
+
+    def test_delete_of_other_workspace_sprint_is_refused(self):
+        response = self.client.post(reverse('projects:sprint_delete', args=[self.project_b.pk, self.sprint_b.pk]))
+        self.assertRedirects(response, reverse('workspaces:list'), fetch_redirect_response=False)
+        self.assertTrue(Sprint.objects.filter(pk=self.sprint_b.pk).exists())
@@ -1,11 +1,18 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.core.paginator import Paginator
+from django.db.models import Q, Count, Exists, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from .models import Project, Sprint
 from .forms import ProjectForm, SprintForm
 from .decorators import project_member_required, project_admin_or_pm_required
 from workspaces.models import Workspace, WorkspaceMember
+from tasks.models import Task
+
+
+# Project cards per page on the project list (a multiple of the 2- and 3-column grid)
+PROJECTS_PER_PAGE = 24
 
 
 @login_required
@@ -16,34 +23,62 @@ def project_list(request):
     # Get workspace filter if provided
     workspace_id = request.GET.get('workspace')
 
-    # Get all workspaces where user is a member
-    user_workspaces = Workspace.objects.filter(members__user=request.user)
+    # Get all workspaces where user is a member (ids cached per user, dropped on membership changes)
+    member_workspace_ids = WorkspaceMember.get_workspace_ids(request.user.pk)
+    user_workspaces = Workspace.objects.filter(pk__in=member_workspace_ids)
 
     if workspace_id:
         projects = Project.objects.filter(
             workspace_id=workspace_id,
-            workspace__members__user=request.user
-        ).select_related('workspace').distinct()
+            workspace_id__in=member_workspace_ids
+        ).select_related('workspace')
         current_workspace = get_object_or_404(Workspace, pk=workspace_id)
     else:
         projects = Project.objects.filter(
-            workspace__members__user=request.user
-        ).select_related('workspace').distinct()
+            workspace_id__in=member_workspace_ids
+        ).select_related('workspace')
         current_workspace = None
 
+    # One correlated COUNT per relation instead of COUNT(DISTINCT) over a tasks x sprints join
+    task_counts = Task.objects.filter(project=OuterRef('pk')).order_by().values('project').annotate(
+        count=Count('*')
+    ).values('count')
+    sprint_counts = Sprint.objects.filter(project=OuterRef('pk')).order_by().values('project').annotate(
+        count=Count('*')
+    ).values('count')
     projects = projects.annotate(
-        task_count=Count('tasks', distinct=True),
-        sprint_count=Count('sprints', distinct=True)
+        task_count=Coalesce(Subquery(task_counts, output_field=IntegerField()), 0),
+        sprint_count=Coalesce(Subquery(sprint_counts, output_field=IntegerField()), 0)
     ).order_by('-created_at')
 
+    # Only the requested page is fetched; the page count runs without the count annotations
+    page_obj = Paginator(projects, PROJECTS_PER_PAGE).get_page(request.GET.get('page'))
+
     context = {
-        'projects': projects,
+        'projects': page_obj,
+        'page_obj': page_obj,
         'workspaces': user_workspaces,
         'current_workspace': current_workspace,
     }
     return render(request, 'projects/project_list.html', context)
 
 
+def _admin_pm_workspaces(request):
+    """
+    Workspaces where the current user is admin or PM, memoized on the request.
+    Filtered with a correlated EXISTS (a semi-join), so no DISTINCT is needed.
+    """
+    if not hasattr(request, '_admin_pm_workspaces'):
+        request._admin_pm_workspaces = Workspace.objects.filter(
+            Exists(WorkspaceMember.objects.filter(
+                workspace=OuterRef('pk'),
+                user=request.user,
+                role__in=['admin', 'pm']
+            ))
+        )
+    return request._admin_pm_workspaces
+
+
 @login_required
 def project_create(request):
     """
@@ -51,38 +86,28 @@ def project_create(request):
     """
     workspace_id = request.GET.get('workspace')
 
+    if not _admin_pm_workspaces(request).exists():
+        messages.error(request, 'You do not have permission to create projects in any workspace.')
+        return redirect('workspaces:list')
+
     if request.method == 'POST':
         form = ProjectForm(request.POST)
+        # Only workspaces where the user is admin or PM validate, so no separate permission lookup
+        form.fields['workspace'].queryset = _admin_pm_workspaces(request)
         if form.is_valid():
             project = form.save(commit=False)
             project.created_by = request.user
-
-            # Check if user has permission in the workspace
-            try:
-                membership = WorkspaceMember.objects.get(
-                    workspace=project.workspace,
-                    user=request.user
-                )
-                if membership.role not in ['admin', 'pm']:
-                    messages.error(request, 'You do not have permission to create projects in this workspace.')
-                    return redirect('workspaces:list')
-
-                project.save()
-                messages.success(request, f'Project "{project.name}" created successfully!')
-                return redirect('projects:detail', pk=project.pk)
-            except WorkspaceMember.DoesNotExist:
-                messages.error(request, 'You are not a member of this workspace.')
-                return redirect('workspaces:list')
+            project.save()
+            messages.success(request, f'Project "{project.name}" created successfully!')
+            return redirect('projects:detail', pk=project.pk)
+        if form.has_error('workspace', 'invalid_choice'):
+            # Say why a workspace the user can see was refused, rather than "Select a valid choice"
+            messages.error(request, 'You do not have permission to create projects in this workspace.')
     else:
         form = ProjectForm()
 
     # Filter workspaces to only show those where user is admin or PM
-    user_workspaces = Workspace.objects.filter(
-        members__user=request.user,
-        members__role__in=['admin', 'pm']
-    ).distinct()
-
-    form.fields['workspace'].queryset = user_workspaces
+    form.fields['workspace'].queryset = _admin_pm_workspaces(request)
 
     # Pre-select workspace if provided
     if workspace_id:
@@ -103,11 +128,16 @@ def project_detail(request, pk):
 
     # Get project statistics
     sprints = project.sprints.all().order_by('-start_date')
-    recent_tasks = project.tasks.select_related('created_by').prefetch_related('assigned_to')[:10]
-
-    # Calculate project progress
-    total_tasks = project.tasks.count()
-    completed_tasks = project.tasks.filter(status='done').count()
+    # The template renders only title and status, so no creator join or assignee prefetch
+    recent_tasks = project.tasks.only('id', 'title', 'status', 'project_id')[:10]
+
+    # Calculate project progress (both counts in one aggregate query)
+    task_stats = project.tasks.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='done'))
+    )
+    total_tasks = task_stats['total']
+    completed_tasks = task_stats['completed']
     progress_percentage = int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0
 
     context = {
@@ -115,8 +145,8 @@ def project_detail(request, pk):
         'membership': membership,
         'sprints': sprints,
         'recent_tasks': recent_tasks,
-        'is_admin': membership.role == 'admin',
-        'is_pm': membership.role in ['admin', 'pm'],
+        'is_admin': membership.is_admin,
+        'is_pm': membership.is_pm,
         'total_tasks': total_tasks,
         'completed_tasks': completed_tasks,
         'progress_percentage': progress_percentage,
@@ -134,6 +164,8 @@ def project_edit(request, pk):
 
     if request.method == 'POST':
         form = ProjectForm(request.POST, instance=project)
+        # Validate the workspace against the same choices the form offers
+        form.fields['workspace'].queryset = _admin_pm_workspaces(request)
         if form.is_valid():
             form.save()
             messages.success(request, f'Project "{project.name}" updated successfully!')
@@ -142,11 +174,7 @@ def project_edit(request, pk):
         form = ProjectForm(instance=project)
 
     # Limit workspace choices to those where user is admin or PM
-    user_workspaces = Workspace.objects.filter(
-        members__user=request.user,
-        members__role__in=['admin', 'pm']
-    ).distinct()
-    form.fields['workspace'].queryset = user_workspaces
+    form.fields['workspace'].queryset = _admin_pm_workspaces(request)
 
     context = {
         'form': form,
@@ -177,6 +205,16 @@ def project_delete(request, pk):
 
 # Sprint Views
 
+def _get_sprint_or_404(project, pk):
+    """
+    Get a sprint of `project` by pk (404 otherwise), reusing the already loaded project.
+    """
+    sprint = get_object_or_404(Sprint, pk=pk, project_id=project.pk)
+    # Anything touching sprint.project (e.g. str(sprint)) uses the decorator's project instead of a new query
+    sprint.project = project
+    return sprint
+
+
 @login_required
 @project_admin_or_pm_required
 def sprint_create(request, project_pk):
@@ -210,7 +248,7 @@ def sprint_edit(request, project_pk, pk):
     Edit sprint details. Only admins and PMs can edit.
     """
     project = request.project
-    sprint = get_object_or_404(Sprint, pk=pk, project=project)
+    sprint = _get_sprint_or_404(project, pk)
 
     if request.method == 'POST':
         form = SprintForm(request.POST, instance=sprint)
@@ -237,7 +275,7 @@ def sprint_delete(request, project_pk, pk):
     Delete sprint. Only admins and PMs can delete.
     """
     project = request.project
-    sprint = get_object_or_404(Sprint, pk=pk, project=project)
+    sprint = _get_sprint_or_404(project, pk)
 
     if request.method == 'POST':
         sprint_name = sprint.name
@@ -1,6 +1,7 @@
 from functools import wraps
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
+from django.db.models import OuterRef, Subquery
 from .models import Task, Subtask
 from workspaces.models import WorkspaceMember
 
@@ -20,21 +21,32 @@ def task_member_required(allowed_roles=None):
                 messages.error(request, 'Invalid task ID.')
                 return redirect('workspaces:list')
 
-            task = get_object_or_404(Task.objects.select_related('project__workspace'), pk=task_id)
-            try:
-                membership = WorkspaceMember.objects.get(
-                    workspace=task.project.workspace,
-                    user=request.user
-                )
-                if allowed_roles and membership.role not in allowed_roles:
-                    messages.error(request, 'You do not have permission to perform this action.')
-                    return redirect('tasks:detail', pk=task_id)
-                request.workspace_membership = membership
-                request.task = task
-                return view_func(request, *args, **kwargs)
-            except WorkspaceMember.DoesNotExist:
+            # The user's membership in the task's workspace comes back with the task (one query)
+            memberships = WorkspaceMember.objects.filter(
+                workspace_id=OuterRef('project__workspace_id'),
+                user=request.user
+            )
+            task = get_object_or_404(
+                Task.objects.select_related('project__workspace').annotate(
+                    _membership_id=Subquery(memberships.values('id')[:1]),
+                    _membership_role=Subquery(memberships.values('role')[:1])
+                ),
+                pk=task_id
+            )
+            if task._membership_id is None:
                 messages.error(request, 'You are not a member of this task\'s workspace.')
                 return redirect('workspaces:list')
+            if allowed_roles and task._membership_role not in allowed_roles:
+                messages.error(request, 'You do not have permission to perform this action.')
+                return redirect('tasks:detail', pk=task_id)
+            request.workspace_membership = WorkspaceMember(
+                id=task._membership_id,
+                workspace=task.project.workspace,
+                user=request.user,
+                role=task._membership_role
+            )
+            request.task = task
+            return view_func(request, *args, **kwargs)
         return wrapper
     return decorator
 
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_sprint_indexes'),
+        ('tasks', '0002_alter_subtask_due_date_alter_subtask_status_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'due_date'], name='tasks_project_16375d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'created_at'], name='tasks_project_a56d01_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status__in', ['todo', 'in_progress'])), fields=['due_date'], name='task_open_due_date_idx'),
+        ),
+    ]
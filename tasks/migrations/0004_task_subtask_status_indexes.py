@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_sprint_indexes'),
+        ('tasks', '0003_task_dashboard_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['task', 'status'], name='subtasks_task_id_02bfcc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['sprint', 'status'], name='tasks_sprint__893507_idx'),
+        ),
+    ]
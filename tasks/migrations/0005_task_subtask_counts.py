@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_subtask_counts(apps, schema_editor):
+    """
+    Fill the new count columns for existing tasks in one UPDATE.
+    """
+    Task = apps.get_model('tasks', 'Task')
+    Subtask = apps.get_model('tasks', 'Subtask')
+
+    subtasks = Subtask.objects.filter(task=OuterRef('pk')).order_by().values('task')
+    Task.objects.update(
+        total_subtasks=Coalesce(Subquery(subtasks.annotate(count=Count('*')).values('count')), 0),
+        completed_subtasks=Coalesce(
+            Subquery(subtasks.filter(status='done').annotate(count=Count('*')).values('count')), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_subtask_status_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_subtasks',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='total_subtasks',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_subtask_counts, migrations.RunPython.noop),
+    ]
@@ -24,22 +24,67 @@ class Task(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='created_tasks')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Subtask counts kept in step by tasks.signals, so progress needs no queries.
+    # Subtask bulk writes (QuerySet.update(), bulk_create()) send no signals and must
+    # call Task.update_subtask_counts() themselves.
+    total_subtasks = models.PositiveIntegerField(default=0, editable=False)
+    completed_subtasks = models.PositiveIntegerField(default=0, editable=False)
     
+    # Written only by update_subtask_counts(), never by a save of the whole row
+    SUBTASK_COUNT_FIELDS = ('total_subtasks', 'completed_subtasks')
+
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        """
+        Save the task without its subtask counters when updating an existing row, so an
+        instance loaded before a subtask changed doesn't write its stale counts back.
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.SUBTASK_COUNT_FIELDS
+            ]
+        super().save(*args, **kwargs)
     
     @property
     def progress_percentage(self):
         """Calculate progress based on completed subtasks."""
-        total_subtasks = self.subtasks.count()
-        if total_subtasks == 0:
+        if self.total_subtasks == 0:
             return 0
-        completed_subtasks = self.subtasks.filter(status='done').count()
-        return int((completed_subtasks / total_subtasks) * 100)
+        return int((self.completed_subtasks / self.total_subtasks) * 100)
+
+    @classmethod
+    def update_subtask_counts(cls, task_id):
+        """
+        Recount a task's subtasks into total_subtasks/completed_subtasks (one aggregate, one UPDATE).
+        Runs on every Subtask save/delete; call it directly after bulk writes to a task's subtasks.
+        """
+        counts = Subtask.objects.filter(task_id=task_id).aggregate(
+            total=models.Count('id'),
+            completed=models.Count('id', filter=models.Q(status='done'))
+        )
+        cls.objects.filter(pk=task_id).update(
+            total_subtasks=counts['total'],
+            completed_subtasks=counts['completed']
+        )
     
     class Meta:
         db_table = 'tasks'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'status', 'due_date']),
+            models.Index(fields=['project', 'created_at']),
+            # Sprint progress counts done tasks per sprint
+            models.Index(fields=['sprint', 'status']),
+            # Open tasks by due date, for the dashboards' overdue/upcoming lists
+            models.Index(
+                fields=['due_date'],
+                condition=models.Q(status__in=['todo', 'in_progress']),
+                name='task_open_due_date_idx'
+            ),
+        ]
 
 
 class Subtask(models.Model):
@@ -69,6 +114,10 @@ class Subtask(models.Model):
     class Meta:
         db_table = 'subtasks'
         ordering = ['created_at']
+        indexes = [
+            # Task progress counts done subtasks per task
+            models.Index(fields=['task', 'status']),
+        ]
 
 
 class Comment(models.Model):
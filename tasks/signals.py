@@ -1,67 +1,142 @@
 """
-Signal handlers for task assignment notifications.
+Signal handlers for task assignment notifications and dashboard cache invalidation.
 """
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
+from flowboard.dashboard import deleted_with, invalidate_workspace_dashboards
+from projects.models import Project, Sprint
+from workspaces.models import Workspace
 from .models import Task, Subtask
 from .tasks import (
-    send_task_assignment_email_async,
-    send_task_assignment_sms_async,
-    send_subtask_assignment_email_async,
-    send_subtask_assignment_sms_async
+    send_task_assignment_batch_async,
+    send_subtask_assignment_batch_async
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@receiver(m2m_changed, sender=Task.assigned_to.through)
-def task_assignment_notification(sender, instance, action, pk_set, **kwargs):
+@receiver(m2m_changed, sender=Task.assigned_to.through, dispatch_uid='task_assign_notify')
+def task_assignment_notification(sender, instance, action, reverse, pk_set, **kwargs):
     """
     Send notifications when users are assigned to a task.
     Triggered when the assigned_to many-to-many relationship changes.
 
     Args:
         sender: The through model for the many-to-many relationship
-        instance: The Task instance
+        instance: The Task instance (the User when reverse is True)
         action: The type of update (pre_add, post_add, pre_remove, post_remove, etc.)
+        reverse: True when the change was made from the user's side of the relation
         pk_set: Set of primary keys of users being added/removed
         kwargs: Additional keyword arguments
     """
-    if action == "post_add" and pk_set:
-        # Users have been added to the task
-        for user_id in pk_set:
-            try:
-                # Queue background tasks (non-blocking)
-                send_task_assignment_email_async(user_id, instance.id)
-                send_task_assignment_sms_async(user_id, instance.id)
+    # Only additions notify; removals, clears and pre_* actions return straight away
+    if action != "post_add" or not pk_set:
+        return
 
-                logger.info(f"Background notifications queued for user {user_id}, task '{instance.title}'")
-            except Exception as e:
-                logger.error(f"Error queuing notifications for user {user_id}: {str(e)}")
+    if reverse:
+        # user.assigned_tasks.add(...): the instance is the user and pk_set holds task ids
+        jobs = [([instance.pk], task_id) for task_id in sorted(pk_set)]
+    else:
+        # Users have been added to the task; one background job notifies all of them
+        jobs = [(sorted(pk_set), instance.pk)]
 
+    for user_ids, task_id in jobs:
+        try:
+            send_task_assignment_batch_async(user_ids, task_id)
+            logger.info(f"Background notifications queued for users {user_ids}, task {task_id}")
+        except Exception as e:
+            logger.error(f"Error queuing notifications for users {user_ids}: {str(e)}")
 
-@receiver(m2m_changed, sender=Subtask.assigned_to.through)
-def subtask_assignment_notification(sender, instance, action, pk_set, **kwargs):
+
+@receiver(m2m_changed, sender=Subtask.assigned_to.through, dispatch_uid='subtask_assign_notify')
+def subtask_assignment_notification(sender, instance, action, reverse, pk_set, **kwargs):
     """
     Send notifications when users are assigned to a subtask.
     Triggered when the assigned_to many-to-many relationship changes.
 
     Args:
         sender: The through model for the many-to-many relationship
-        instance: The Subtask instance
+        instance: The Subtask instance (the User when reverse is True)
         action: The type of update (pre_add, post_add, pre_remove, post_remove, etc.)
+        reverse: True when the change was made from the user's side of the relation
         pk_set: Set of primary keys of users being added/removed
         kwargs: Additional keyword arguments
     """
-    if action == "post_add" and pk_set:
-        # Users have been added to the subtask
-        for user_id in pk_set:
-            try:
-                # Queue background tasks (non-blocking)
-                send_subtask_assignment_email_async(user_id, instance.id)
-                send_subtask_assignment_sms_async(user_id, instance.id)
-
-                logger.info(f"Background notifications queued for user {user_id}, subtask '{instance.title}'")
-            except Exception as e:
-                logger.error(f"Error queuing notifications for user {user_id}: {str(e)}")
+    # Only additions notify; removals, clears and pre_* actions return straight away
+    if action != "post_add" or not pk_set:
+        return
+
+    if reverse:
+        # user.assigned_subtasks.add(...): the instance is the user and pk_set holds subtask ids
+        jobs = [([instance.pk], subtask_id) for subtask_id in sorted(pk_set)]
+    else:
+        # Users have been added to the subtask; one background job notifies all of them
+        jobs = [(sorted(pk_set), instance.pk)]
+
+    for user_ids, subtask_id in jobs:
+        try:
+            send_subtask_assignment_batch_async(user_ids, subtask_id)
+            logger.info(f"Background notifications queued for users {user_ids}, subtask {subtask_id}")
+        except Exception as e:
+            logger.error(f"Error queuing notifications for users {user_ids}: {str(e)}")
+
+
+def project_workspace_ids(**lookup):
+    """Workspace ids of the projects matching `lookup`."""
+    return Project.objects.filter(**lookup).values_list('workspace_id', flat=True)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Sprint)
+@receiver(post_delete, sender=Sprint)
+def project_dashboard_invalidation(sender, instance, origin=None, **kwargs):
+    """
+    Make the workspace's cached dashboards stale when a task or sprint changes.
+    A project or workspace delete invalidates once for everything it cascades to.
+    """
+    if origin is not None and deleted_with(origin, Project, Workspace):
+        return
+
+    invalidate_workspace_dashboards(project_workspace_ids(pk=instance.project_id))
+
+
+@receiver(post_save, sender=Subtask)
+@receiver(post_delete, sender=Subtask)
+def subtask_changed(sender, instance, origin=None, **kwargs):
+    """
+    Keep the parent task's stored subtask counts current and make the workspace's
+    cached dashboards stale when a subtask changes.
+    Nothing to do when the task goes too: its own post_delete covers the dashboards.
+    """
+    if origin is not None and deleted_with(origin, Task, Project, Workspace):
+        return
+
+    Task.update_subtask_counts(instance.task_id)
+    invalidate_workspace_dashboards(project_workspace_ids(tasks=instance.task_id))
+
+
+@receiver(m2m_changed, sender=Task.assigned_to.through)
+@receiver(m2m_changed, sender=Subtask.assigned_to.through)
+def assignment_dashboard_invalidation(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Make cached dashboards stale when assignees change.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        if isinstance(instance, Subtask):
+            workspace_ids = project_workspace_ids(tasks=instance.task_id)
+        else:
+            workspace_ids = project_workspace_ids(pk=instance.project_id)
+    elif not pk_set:
+        # user.assigned_tasks.clear() doesn't say which tasks the user was taken off
+        workspace_ids = instance.workspace_memberships.values_list('workspace_id', flat=True)
+    elif sender is Task.assigned_to.through:
+        # user.assigned_tasks.add(...): the instance is the user and pk_set holds task ids
+        workspace_ids = project_workspace_ids(tasks__in=pk_set)
+    else:
+        workspace_ids = project_workspace_ids(tasks__subtasks__in=pk_set)
+    invalidate_workspace_dashboards(workspace_ids)
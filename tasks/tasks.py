@@ -2,39 +2,44 @@
 Background task definitions for task notifications.
 """
 from background_task import background
-from django.core.mail import send_mail
+from django.core.mail import get_connection, send_mail
 from django.conf import settings
 from django.urls import reverse
-import httpx
+from functools import lru_cache
+from flowboard.sms import SMSUnavailableError, defer_sms_job, post_sms
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Columns the notification messages read, so the jobs below load nothing else
+RECIPIENT_FIELDS = ('id', 'username', 'email', 'phone_number')
+TASK_NOTIFICATION_FIELDS = (
+    'id', 'title', 'description', 'status', 'due_date', 'project__name', 'project__workspace__name'
+)
+SUBTASK_NOTIFICATION_FIELDS = (
+    'id', 'title', 'description', 'status', 'due_date',
+    'task__title', 'task__project__name', 'task__project__workspace__name'
+)
 
-@background(schedule=0)
-def send_task_assignment_email_async(user_id, task_id):
-    """
-    Background task to send email notification when a user is assigned to a task.
 
-    Args:
-        user_id: ID of User who was assigned
-        task_id: ID of Task they were assigned to
-    """
-    from accounts.models import User
-    from tasks.models import Task
+@lru_cache(maxsize=4096)
+def _task_detail_url(task_id):
+    """Absolute URL of a task's detail page, resolved once per task per worker process."""
+    task_path = reverse('tasks:detail', kwargs={'pk': task_id})
+    site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
+    return f"{site_url.rstrip('/')}{task_path}"
 
-    try:
-        user = User.objects.get(pk=user_id)
-        task = Task.objects.select_related('project__workspace', 'created_by').get(pk=task_id)
 
-        # Generate the task detail URL
-        task_path = reverse('tasks:detail', kwargs={'pk': task.pk})
-        site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
-        task_url = f"{site_url.rstrip('/')}{task_path}"
+def _task_assignment_email(task):
+    """
+    Subject and body (everything after the greeting) of the task assignment email.
+    They are the same for every assignee, so a batch builds them once.
+    """
+    # Generate the task detail URL
+    task_url = _task_detail_url(task.pk)
 
-        subject = f'You have been assigned to: {task.title}'
-        message = f"""
-Hello {user.username},
+    subject = f'You have been assigned to: {task.title}'
+    body = f"""
 
 You have been assigned to a new task in FlowBoard.
 
@@ -53,25 +58,33 @@ Please log in to FlowBoard to view more details and update the task status.
 
 Best regards,
 FlowBoard Team
-        """
-
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-        logger.info(f"Background email sent to {user.email} for task assignment: {task.title}")
-    except Exception as e:
-        logger.error(f"Failed to send background email: {str(e)}")
-        raise  # Re-raise to trigger retry
+    """
+    return subject, body
+
+
+def _send_task_assignment_email(user, task, connection=None, email=None):
+    """
+    Email `user` about their assignment to `task`; raises on failure.
+    `email` is a (subject, body) pair from _task_assignment_email(task), when already built.
+    """
+    subject, body = email or _task_assignment_email(task)
+    message = f"\nHello {user.username},{body}"
+
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+        fail_silently=False,
+        connection=connection,
+    )
+    logger.info(f"Background email sent to {user.email} for task assignment: {task.title}")
 
 
 @background(schedule=0)
-def send_task_assignment_sms_async(user_id, task_id):
+def send_task_assignment_email_async(user_id, task_id):
     """
-    Background task to send SMS notification when a user is assigned to a task.
+    Background task to send email notification when a user is assigned to a task.
 
     Args:
         user_id: ID of User who was assigned
@@ -81,89 +94,144 @@ def send_task_assignment_sms_async(user_id, task_id):
     from tasks.models import Task
 
     try:
-        user = User.objects.get(pk=user_id)
-        task = Task.objects.select_related('project__workspace').get(pk=task_id)
+        user = User.objects.only(*RECIPIENT_FIELDS).get(pk=user_id)
+        task = Task.objects.select_related('project__workspace').only(*TASK_NOTIFICATION_FIELDS).get(pk=task_id)
+        _send_task_assignment_email(user, task)
+    except Exception as e:
+        logger.error(f"Failed to send background email: {str(e)}")
+        raise  # Re-raise to trigger retry
 
-        # Check if user has a phone number
-        if not user.phone_number:
+
+def _send_sms(phone_numbers, message_body):
+    """
+    Send one SMS to every number in `phone_numbers` with a single Mnotify request
+    (the API takes a recipient list); raises on failure.
+    """
+    # Check if Mnotify API key is configured
+    if not getattr(settings, 'MNOTIFY_API_KEY', None):
+        logger.warning(f"Mnotify API key not configured. SMS to {', '.join(phone_numbers)} not sent.")
+        logger.info(f"SMS MESSAGE (would be sent to {', '.join(phone_numbers)}):\n{message_body}")
+        return
+
+    # Send SMS over the shared keep-alive client (SMSUnavailableError means retry later)
+    response = post_sms(phone_numbers, message_body)
+    result = response.json()
+
+    # Check if SMS was sent successfully
+    if response.status_code == 200:
+        logger.info(f"Background SMS sent to {', '.join(phone_numbers)}. Response: {result}")
+    else:
+        logger.error(f"Failed to send SMS. Status: {response.status_code}, Response: {result}")
+        raise Exception(f"SMS API error: {result}")
+
+
+def _phone_numbers(users):
+    """Phone numbers of `users`, logging the ones that have none."""
+    phone_numbers = []
+    for user in users:
+        if user.phone_number:
+            phone_numbers.append(user.phone_number)
+        else:
             logger.warning(f"User {user.username} has no phone number. SMS not sent.")
-            return
+    return phone_numbers
+
+
+def _send_task_assignment_sms(users, task):
+    """Text `users` about their assignment to `task` in one request; raises on failure."""
+    phone_numbers = _phone_numbers(users)
+    if not phone_numbers:
+        return
 
-        # Generate the task detail URL
-        task_path = reverse('tasks:detail', kwargs={'pk': task.pk})
-        site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
-        task_url = f"{site_url.rstrip('/')}{task_path}"
+    # Generate the task detail URL
+    task_url = _task_detail_url(task.pk)
 
-        message_body = f"""FlowBoard: You've been assigned to '{task.title}' in project '{task.project.name}'.
+    message_body = f"""FlowBoard: You've been assigned to '{task.title}' in project '{task.project.name}'.
 Due: {task.due_date if task.due_date else 'Not set'}
 View: {task_url}
 
 - FlowBoard Team""".strip()
 
-        # Check if Mnotify API key is configured
-        mnotify_api_key = getattr(settings, 'MNOTIFY_API_KEY', None)
-        mnotify_sender = getattr(settings, 'MNOTIFY_SENDER', 'FlowBoard')
-
-        if not mnotify_api_key:
-            logger.warning(f"Mnotify API key not configured. SMS to {user.phone_number} not sent.")
-            logger.info(f"SMS MESSAGE (would be sent to {user.phone_number}):\n{message_body}")
-            return
-
-        # Mnotify API endpoint
-        url = f"https://api.mnotify.com/api/sms/quick?key={mnotify_api_key}"
-
-        # Prepare payload
-        payload = {
-            "recipient": [user.phone_number],
-            "sender": mnotify_sender,
-            "message": message_body,
-            "is_schedule": False,
-            "schedule_date": ""
-        }
-
-        headers = {"Content-Type": "application/json"}
-
-        # Send SMS using httpx synchronous client
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(url, json=payload, headers=headers)
-            result = response.json()
-
-            # Check if SMS was sent successfully
-            if response.status_code == 200:
-                logger.info(f"Background SMS sent to {user.phone_number} for task: {task.title}. Response: {result}")
-            else:
-                logger.error(f"Failed to send SMS. Status: {response.status_code}, Response: {result}")
-                raise Exception(f"SMS API error: {result}")
+    _send_sms(phone_numbers, message_body)
+    logger.info(f"Background SMS sent for task: {task.title}")
+
+
+@background(schedule=0)
+def send_task_assignment_sms_async(user_id, task_id, deferrals=0):
+    """
+    Background task to send SMS notification when a user is assigned to a task.
+
+    Args:
+        user_id: ID of User who was assigned
+        task_id: ID of Task they were assigned to
+        deferrals: Times this SMS was already put off while Mnotify was unavailable
+    """
+    from accounts.models import User
+    from tasks.models import Task
 
+    try:
+        user = User.objects.only(*RECIPIENT_FIELDS).get(pk=user_id)
+        task = Task.objects.select_related('project__workspace').only(*TASK_NOTIFICATION_FIELDS).get(pk=task_id)
+        _send_task_assignment_sms([user], task)
+    except SMSUnavailableError:
+        # Mnotify is down or saturated; retry later rather than spending the job's attempts
+        defer_sms_job(send_task_assignment_sms_async, deferrals, user_id, task_id)
     except Exception as e:
         logger.error(f"Failed to send background SMS: {str(e)}")
         raise  # Re-raise to trigger retry
 
 
 @background(schedule=0)
-def send_subtask_assignment_email_async(user_id, subtask_id):
+def send_task_assignment_batch_async(user_ids, task_id):
     """
-    Background task to send email notification when a user is assigned to a subtask.
+    Background task to send email and SMS notifications to everyone just assigned to a task.
+    The task and the users are loaded once, the emails share one SMTP connection and the
+    SMS goes out as one Mnotify request. A failed notification is queued again per user,
+    so a retry never re-notifies the rest of the batch.
 
     Args:
-        user_id: ID of User who was assigned
-        subtask_id: ID of Subtask they were assigned to
+        user_ids: IDs of Users who were assigned
+        task_id: ID of Task they were assigned to
     """
     from accounts.models import User
-    from tasks.models import Subtask
+    from tasks.models import Task
+
+    task = Task.objects.select_related('project__workspace').only(*TASK_NOTIFICATION_FIELDS).get(pk=task_id)
+    users = list(User.objects.filter(pk__in=user_ids).only(*RECIPIENT_FIELDS))
 
+    # Every email shares one body and goes over one SMTP connection
+    email = _task_assignment_email(task)
+    with get_connection() as connection:
+        for user in users:
+            try:
+                _send_task_assignment_email(user, task, connection=connection, email=email)
+            except Exception as e:
+                logger.error(f"Failed to send background email to user {user.pk}: {str(e)}")
+                send_task_assignment_email_async(user.pk, task_id)
+
+    # The SMS text is the same for everyone, so one Mnotify request covers all recipients
     try:
-        user = User.objects.get(pk=user_id)
-        subtask = Subtask.objects.select_related('task__project__workspace', 'created_by').get(pk=subtask_id)
+        _send_task_assignment_sms(users, task)
+    except SMSUnavailableError:
+        for user in users:
+            if user.phone_number:
+                defer_sms_job(send_task_assignment_sms_async, 0, user.pk, task_id)
+    except Exception as e:
+        logger.error(f"Failed to send background SMS to users {user_ids}: {str(e)}")
+        for user in users:
+            if user.phone_number:
+                send_task_assignment_sms_async(user.pk, task_id)
 
-        # Generate the task detail URL (subtasks are viewed on the parent task page)
-        task_path = reverse('tasks:detail', kwargs={'pk': subtask.task.pk})
-        site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
-        task_url = f"{site_url.rstrip('/')}{task_path}"
 
-        subject = f'You have been assigned to subtask: {subtask.title}'
-        message = f"""
-Hello {user.username},
+def _subtask_assignment_email(subtask):
+    """
+    Subject and body (everything after the greeting) of the subtask assignment email.
+    They are the same for every assignee, so a batch builds them once.
+    """
+    # Generate the task detail URL (subtasks are viewed on the parent task page)
+    task_url = _task_detail_url(subtask.task_id)
+
+    subject = f'You have been assigned to subtask: {subtask.title}'
+    body = f"""
 
 You have been assigned to a new subtask in FlowBoard.
 
@@ -183,25 +251,33 @@ Please log in to FlowBoard to view more details and update the subtask status.
 
 Best regards,
 FlowBoard Team
-        """
-
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-        logger.info(f"Background email sent to {user.email} for subtask assignment: {subtask.title}")
-    except Exception as e:
-        logger.error(f"Failed to send background email: {str(e)}")
-        raise  # Re-raise to trigger retry
+    """
+    return subject, body
+
+
+def _send_subtask_assignment_email(user, subtask, connection=None, email=None):
+    """
+    Email `user` about their assignment to `subtask`; raises on failure.
+    `email` is a (subject, body) pair from _subtask_assignment_email(subtask), when already built.
+    """
+    subject, body = email or _subtask_assignment_email(subtask)
+    message = f"\nHello {user.username},{body}"
+
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+        fail_silently=False,
+        connection=connection,
+    )
+    logger.info(f"Background email sent to {user.email} for subtask assignment: {subtask.title}")
 
 
 @background(schedule=0)
-def send_subtask_assignment_sms_async(user_id, subtask_id):
+def send_subtask_assignment_email_async(user_id, subtask_id):
     """
-    Background task to send SMS notification when a user is assigned to a subtask.
+    Background task to send email notification when a user is assigned to a subtask.
 
     Args:
         user_id: ID of User who was assigned
@@ -211,60 +287,92 @@ def send_subtask_assignment_sms_async(user_id, subtask_id):
     from tasks.models import Subtask
 
     try:
-        user = User.objects.get(pk=user_id)
-        subtask = Subtask.objects.select_related('task__project__workspace').get(pk=subtask_id)
+        user = User.objects.only(*RECIPIENT_FIELDS).get(pk=user_id)
+        subtask = Subtask.objects.select_related('task__project__workspace').only(*SUBTASK_NOTIFICATION_FIELDS).get(pk=subtask_id)
+        _send_subtask_assignment_email(user, subtask)
+    except Exception as e:
+        logger.error(f"Failed to send background email: {str(e)}")
+        raise  # Re-raise to trigger retry
 
-        # Check if user has a phone number
-        if not user.phone_number:
-            logger.warning(f"User {user.username} has no phone number. SMS not sent.")
-            return
 
-        # Generate the task detail URL (subtasks are viewed on the parent task page)
-        task_path = reverse('tasks:detail', kwargs={'pk': subtask.task.pk})
-        site_url = getattr(settings, 'SITE_URL', 'http://localhost:8000')
-        task_url = f"{site_url.rstrip('/')}{task_path}"
+def _send_subtask_assignment_sms(users, subtask):
+    """Text `users` about their assignment to `subtask` in one request; raises on failure."""
+    phone_numbers = _phone_numbers(users)
+    if not phone_numbers:
+        return
 
-        message_body = f"""FlowBoard: You've been assigned to subtask '{subtask.title}' in task '{subtask.task.title}'.
+    # Generate the task detail URL (subtasks are viewed on the parent task page)
+    task_url = _task_detail_url(subtask.task_id)
+
+    message_body = f"""FlowBoard: You've been assigned to subtask '{subtask.title}' in task '{subtask.task.title}'.
 Due: {subtask.due_date if subtask.due_date else 'Not set'}
 View: {task_url}
 
 - FlowBoard Team""".strip()
 
-        # Check if Mnotify API key is configured
-        mnotify_api_key = getattr(settings, 'MNOTIFY_API_KEY', None)
-        mnotify_sender = getattr(settings, 'MNOTIFY_SENDER', 'FlowBoard')
-
-        if not mnotify_api_key:
-            logger.warning(f"Mnotify API key not configured. SMS to {user.phone_number} not sent.")
-            logger.info(f"SMS MESSAGE (would be sent to {user.phone_number}):\n{message_body}")
-            return
-
-        # Mnotify API endpoint
-        url = f"https://api.mnotify.com/api/sms/quick?key={mnotify_api_key}"
-
-        # Prepare payload
-        payload = {
-            "recipient": [user.phone_number],
-            "sender": mnotify_sender,
-            "message": message_body,
-            "is_schedule": False,
-            "schedule_date": ""
-        }
-
-        headers = {"Content-Type": "application/json"}
-
-        # Send SMS using httpx synchronous client
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(url, json=payload, headers=headers)
-            result = response.json()
-
-            # Check if SMS was sent successfully
-            if response.status_code == 200:
-                logger.info(f"Background SMS sent to {user.phone_number} for subtask: {subtask.title}. Response: {result}")
-            else:
-                logger.error(f"Failed to send SMS. Status: {response.status_code}, Response: {result}")
-                raise Exception(f"SMS API error: {result}")
+    _send_sms(phone_numbers, message_body)
+    logger.info(f"Background SMS sent for subtask: {subtask.title}")
+
+
+@background(schedule=0)
+def send_subtask_assignment_sms_async(user_id, subtask_id, deferrals=0):
+    """
+    Background task to send SMS notification when a user is assigned to a subtask.
 
+    Args:
+        user_id: ID of User who was assigned
+        subtask_id: ID of Subtask they were assigned to
+        deferrals: Times this SMS was already put off while Mnotify was unavailable
+    """
+    from accounts.models import User
+    from tasks.models import Subtask
+
+    try:
+        user = User.objects.only(*RECIPIENT_FIELDS).get(pk=user_id)
+        subtask = Subtask.objects.select_related('task__project__workspace').only(*SUBTASK_NOTIFICATION_FIELDS).get(pk=subtask_id)
+        _send_subtask_assignment_sms([user], subtask)
+    except SMSUnavailableError:
+        # Mnotify is down or saturated; retry later rather than spending the job's attempts
+        defer_sms_job(send_subtask_assignment_sms_async, deferrals, user_id, subtask_id)
     except Exception as e:
         logger.error(f"Failed to send background SMS: {str(e)}")
         raise  # Re-raise to trigger retry
+
+
+@background(schedule=0)
+def send_subtask_assignment_batch_async(user_ids, subtask_id):
+    """
+    Background task to send email and SMS notifications to everyone just assigned to a subtask.
+    Loads the subtask and the users once, shares one SMTP connection and one SMS request;
+    failures are queued again per user (see send_task_assignment_batch_async).
+
+    Args:
+        user_ids: IDs of Users who were assigned
+        subtask_id: ID of Subtask they were assigned to
+    """
+    from accounts.models import User
+    from tasks.models import Subtask
+
+    subtask = Subtask.objects.select_related('task__project__workspace').only(*SUBTASK_NOTIFICATION_FIELDS).get(pk=subtask_id)
+    users = list(User.objects.filter(pk__in=user_ids).only(*RECIPIENT_FIELDS))
+
+    email = _subtask_assignment_email(subtask)
+    with get_connection() as connection:
+        for user in users:
+            try:
+                _send_subtask_assignment_email(user, subtask, connection=connection, email=email)
+            except Exception as e:
+                logger.error(f"Failed to send background email to user {user.pk}: {str(e)}")
+                send_subtask_assignment_email_async(user.pk, subtask_id)
+
+    try:
+        _send_subtask_assignment_sms(users, subtask)
+    except SMSUnavailableError:
+        for user in users:
+            if user.phone_number:
+                defer_sms_job(send_subtask_assignment_sms_async, 0, user.pk, subtask_id)
+    except Exception as e:
+        logger.error(f"Failed to send background SMS to users {user_ids}: {str(e)}")
+        for user in users:
+            if user.phone_number:
+                send_subtask_assignment_sms_async(user.pk, subtask_id)
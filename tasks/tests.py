@@ -1,3 +1,81 @@
+from unittest import mock
 from django.test import TestCase
+from accounts.models import User
+from projects.models import Project
+from workspaces.models import Workspace
+from .models import Task, Subtask
 
-# Create your tests here.
+
+class SubtaskProgressTests(TestCase):
+    """Task.total_subtasks/completed_subtasks are kept in step by tasks.signals."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        self.workspace = Workspace.objects.create(name='Workspace', created_by=self.user)
+        self.project = Project.objects.create(workspace=self.workspace, name='Project', created_by=self.user)
+        self.task = Task.objects.create(project=self.project, title='Task', created_by=self.user)
+
+    def add_subtask(self, status='todo'):
+        return Subtask.objects.create(task=self.task, title='Subtask', status=status, created_by=self.user)
+
+    def progress(self):
+        self.task.refresh_from_db()
+        return self.task.progress_percentage
+
+    def test_create_updates_progress(self):
+        self.assertEqual(self.progress(), 0)
+        self.add_subtask(status='done')
+        self.add_subtask()
+        self.assertEqual(self.progress(), 50)
+        self.assertEqual((self.task.total_subtasks, self.task.completed_subtasks), (2, 1))
+
+    def test_status_change_updates_progress(self):
+        subtask = self.add_subtask()
+        self.add_subtask()
+        self.assertEqual(self.progress(), 0)
+        subtask.status = 'done'
+        subtask.save()
+        self.assertEqual(self.progress(), 50)
+        subtask.status = 'in_progress'
+        subtask.save()
+        self.assertEqual(self.progress(), 0)
+
+    def test_delete_updates_progress(self):
+        done = self.add_subtask(status='done')
+        self.add_subtask()
+        self.assertEqual(self.progress(), 50)
+        self.add_subtask(status='done').delete()
+        self.assertEqual(self.progress(), 50)
+        done.delete()
+        self.assertEqual(self.progress(), 0)
+        self.assertEqual(self.task.total_subtasks, 1)
+
+    def test_bulk_update_needs_explicit_recount(self):
+        self.add_subtask()
+        self.task.subtasks.update(status='done')
+        self.assertEqual(self.progress(), 0)
+        Task.update_subtask_counts(self.task.pk)
+        self.assertEqual(self.progress(), 100)
+
+    def test_saving_stale_task_keeps_counts(self):
+        task = Task.objects.get(pk=self.task.pk)
+        self.add_subtask(status='done')
+        # The loaded task still holds (0, 0); a status change or edit must not write that back
+        task.status = 'in_progress'
+        task.save()
+        self.assertEqual(self.progress(), 100)
+        self.assertEqual((self.task.status, self.task.total_subtasks), ('in_progress', 1))
+
+    def test_task_delete_skips_recount(self):
+        self.add_subtask()
+        self.add_subtask()
+        with mock.patch.object(Task, 'update_subtask_counts') as recount:
+            self.task.delete()
+        recount.assert_not_called()
+        self.assertFalse(Subtask.objects.exists())
+
+    def test_project_delete_skips_recount(self):
+        self.add_subtask()
+        with mock.patch.object(Task, 'update_subtask_counts') as recount:
+            Project.objects.filter(pk=self.project.pk).delete()
+        recount.assert_not_called()
@@ -1,4 +1,4 @@
-from django.urls import path
+from django.urls import include, path
 from . import views
 
 app_name = 'tasks'
@@ -11,13 +11,15 @@ urlpatterns = [
     path('<int:pk>/delete/', views.task_delete, name='delete'),
     path('<int:pk>/status/', views.task_update_status, name='update_status'),
 
-    # Subtask URLs
-    path('<int:task_pk>/subtasks/create/', views.subtask_create, name='subtask_create'),
-    path('<int:task_pk>/subtasks/<int:pk>/edit/', views.subtask_edit, name='subtask_edit'),
-    path('<int:task_pk>/subtasks/<int:pk>/delete/', views.subtask_delete, name='subtask_delete'),
-    path('<int:task_pk>/subtasks/<int:pk>/status/', views.subtask_update_status, name='subtask_update_status'),
+    # Subtask URLs (one shared prefix, so other requests skip the whole group in one check)
+    path('<int:task_pk>/subtasks/', include([
+        path('create/', views.subtask_create, name='subtask_create'),
+        path('<int:pk>/edit/', views.subtask_edit, name='subtask_edit'),
+        path('<int:pk>/delete/', views.subtask_delete, name='subtask_delete'),
+        path('<int:pk>/status/', views.subtask_update_status, name='subtask_update_status'),
+        path('<int:subtask_pk>/comments/add/', views.subtask_comment_add, name='subtask_comment_add'),
+    ])),
 
     # Comment URLs
     path('<int:task_pk>/comments/add/', views.comment_add, name='comment_add'),
-    path('<int:task_pk>/subtasks/<int:subtask_pk>/comments/add/', views.subtask_comment_add, name='subtask_comment_add'),
-]
\ No newline at end of file
+]
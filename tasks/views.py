@@ -54,22 +54,20 @@ def task_create(request):
             task = form.save(commit=False)
             task.created_by = request.user
 
-            try:
-                membership = WorkspaceMember.objects.get(
-                    workspace=task.project.workspace,
-                    user=request.user
-                )
-                if membership.role not in ['admin', 'pm']:
-                    messages.error(request, 'You do not have permission to create tasks in this project.')
-                    return redirect('workspaces:list')
-
-                task.save()
-                form.save_m2m()  # Save many-to-many relationships
-                messages.success(request, f'Task "{task.title}" created successfully!')
-                return redirect('tasks:detail', pk=task.pk)
-            except WorkspaceMember.DoesNotExist:
-                messages.error(request, 'You are not a member of this workspace.')
+            # One indexed existence probe on (workspace, user) instead of loading the membership
+            can_create = WorkspaceMember.objects.filter(
+                workspace_id=task.project.workspace_id,
+                user=request.user,
+                role__in=['admin', 'pm']
+            ).exists()
+            if not can_create:
+                messages.error(request, 'You do not have permission to create tasks in this project.')
                 return redirect('workspaces:list')
+
+            task.save()
+            form.save_m2m()  # Save many-to-many relationships
+            messages.success(request, f'Task "{task.title}" created successfully!')
+            return redirect('tasks:detail', pk=task.pk)
     else:
         form = TaskForm()
 
@@ -122,10 +120,10 @@ def task_detail(request, pk):
         'membership': membership,
         'subtasks': subtasks,
         'comments': comments,
-        'is_admin': membership.role == 'admin',
-        'is_pm': membership.role in ['admin', 'pm'],
+        'is_admin': membership.is_admin,
+        'is_pm': membership.is_pm,
         'is_assigned': is_assigned,
-        'can_edit': membership.role in ['admin', 'pm'] or is_assigned,
+        'can_edit': membership.is_pm or is_assigned,
         'comment_form': CommentForm(),
     }
     return render(request, 'tasks/task_detail.html', context)
@@ -191,7 +189,7 @@ def task_update_status(request, pk):
     membership = request.workspace_membership
     is_assigned = request.user in task.assigned_to.all()
 
-    if membership.role not in ['admin', 'pm'] and not is_assigned:
+    if not membership.is_pm and not is_assigned:
         messages.error(request, 'You do not have permission to update this task.')
         return redirect('tasks:detail', pk=pk)
 
@@ -252,7 +250,7 @@ def subtask_edit(request, task_pk, pk):
         messages.error(request, 'You are not a member of this workspace.')
         return redirect('workspaces:list')
 
-    if membership.role not in ['admin', 'pm']:
+    if not membership.is_pm:
         messages.error(request, 'You do not have permission to edit subtasks.')
         return redirect('tasks:detail', pk=task_pk)
 
@@ -288,7 +286,7 @@ def subtask_delete(request, task_pk, pk):
         user=request.user
     ).first()
 
-    if not membership or membership.role not in ['admin', 'pm']:
+    if not membership or not membership.is_pm:
         messages.error(request, 'You do not have permission to delete subtasks.')
         return redirect('tasks:detail', pk=task_pk)
 
@@ -322,7 +320,7 @@ def subtask_update_status(request, task_pk, pk):
 
     is_assigned = request.user in subtask.assigned_to.all()
 
-    if membership.role not in ['admin', 'pm'] and not is_assigned:
+    if not membership.is_pm and not is_assigned:
         messages.error(request, 'You do not have permission to update this subtask.')
         return redirect('tasks:detail', pk=task_pk)
 
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class WorkspacesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'workspaces'
+
+    def ready(self):
+        """
+        Import signals when the app is ready.
+        This ensures that signal handlers are registered.
+        """
+        import workspaces.signals
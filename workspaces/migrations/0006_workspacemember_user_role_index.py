@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 01:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspaces', '0005_alter_workspaceinvitation_is_used_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workspacemember',
+            index=models.Index(fields=['user', 'role'], name='workspace_m_user_id_1bf1a2_idx'),
+        ),
+    ]
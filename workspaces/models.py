@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 import secrets
@@ -42,10 +43,40 @@ class WorkspaceMember(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.workspace.name} ({self.role})"
+
+    @property
+    def is_admin(self):
+        """Whether this member administers the workspace."""
+        return self.role == 'admin'
+
+    @property
+    def is_pm(self):
+        """Whether this member can manage projects (admins and project managers)."""
+        return self.role in ['admin', 'pm']
+
+    # Seconds a user's workspace id list stays cached; membership writes drop it sooner
+    CACHE_TIMEOUT = 60 * 5
+
+    @staticmethod
+    def get_user_cache_key(user_id):
+        """Cache key for a user's workspace ids (see workspaces.signals)."""
+        return f'user_workspaces:{user_id}'
+
+    @classmethod
+    def get_workspace_ids(cls, user_id):
+        """Ids of the workspaces `user_id` belongs to, from the cache when possible."""
+        return cache.get_or_set(
+            cls.get_user_cache_key(user_id),
+            lambda: list(cls.objects.filter(user_id=user_id).values_list('workspace_id', flat=True)),
+            cls.CACHE_TIMEOUT
+        )
     
     class Meta:
         db_table = 'workspace_members'
         unique_together = ['workspace', 'user']
+        indexes = [
+            models.Index(fields=['user', 'role']),
+        ]
         ordering = ['workspace', 'role']
 
 
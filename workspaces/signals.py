@@ -0,0 +1,41 @@
+"""
+Signal handlers that keep cached workspace data and dashboards in sync with
+workspaces and memberships.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from flowboard.dashboard import deleted_with, invalidate_workspace_dashboards
+from .models import Workspace, WorkspaceMember
+
+
+@receiver(post_save, sender=WorkspaceMember)
+@receiver(post_delete, sender=WorkspaceMember)
+def invalidate_user_workspaces(sender, instance, **kwargs):
+    """
+    Drop the member's cached workspace ids when one of their memberships
+    is created, changed or deleted.
+    """
+    cache.delete(WorkspaceMember.get_user_cache_key(instance.user_id))
+
+
+@receiver(post_save, sender=WorkspaceMember)
+@receiver(post_delete, sender=WorkspaceMember)
+def member_dashboard_invalidation(sender, instance, origin=None, **kwargs):
+    """
+    Make the workspace's cached dashboards stale when a member joins, leaves or changes
+    role (member counts and role-based views change for everyone in it).
+    """
+    if origin is not None and deleted_with(origin, Workspace):
+        return
+
+    invalidate_workspace_dashboards([instance.workspace_id])
+
+
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def workspace_dashboard_invalidation(sender, instance, **kwargs):
+    """
+    Make the workspace's cached dashboards stale when it is created, renamed or deleted.
+    """
+    invalidate_workspace_dashboards([instance.pk])
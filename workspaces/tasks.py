@@ -5,7 +5,7 @@ from background_task import background
 from django.core.mail import send_mail
 from django.conf import settings
 from django.urls import reverse
-import httpx
+from flowboard.sms import SMSUnavailableError, defer_sms_job, post_sms
 import logging
 
 logger = logging.getLogger(__name__)
@@ -77,12 +77,13 @@ The FlowBoard Team
 
 
 @background(schedule=0)
-def send_invitation_sms_async(invitation_id):
+def send_invitation_sms_async(invitation_id, deferrals=0):
     """
     Background task to send SMS invitation to join a workspace using Mnotify API.
 
     Args:
         invitation_id: ID of WorkspaceInvitation object
+        deferrals: Times this SMS was already put off while Mnotify was unavailable
     """
     from workspaces.models import WorkspaceInvitation
 
@@ -113,40 +114,25 @@ Expires: {invitation.expires_at.strftime('%b %d, %Y')}
 - FlowBoard Team"""
 
         # Check if Mnotify API key is configured
-        mnotify_api_key = getattr(settings, 'MNOTIFY_API_KEY', None)
-        mnotify_sender = getattr(settings, 'MNOTIFY_SENDER', 'FlowBoard')
-
-        if not mnotify_api_key:
+        if not getattr(settings, 'MNOTIFY_API_KEY', None):
             logger.warning(f"Mnotify API key not configured. SMS to {invitation.recipient_phone} not sent.")
             logger.info(f"SMS MESSAGE (would be sent to {invitation.recipient_phone}):\n{message}")
             return
 
-        # Mnotify API endpoint
-        url = f"https://api.mnotify.com/api/sms/quick?key={mnotify_api_key}"
-
-        # Prepare payload
-        payload = {
-            "recipient": [invitation.recipient_phone],
-            "sender": mnotify_sender,
-            "message": message,
-            "is_schedule": False,
-            "schedule_date": ""
-        }
-
-        headers = {"Content-Type": "application/json"}
-
-        # Send SMS using httpx synchronous client
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(url, json=payload, headers=headers)
-            result = response.json()
+        # Send SMS over the shared keep-alive client (SMSUnavailableError means retry later)
+        response = post_sms([invitation.recipient_phone], message)
+        result = response.json()
 
-            # Check if SMS was sent successfully
-            if response.status_code == 200:
-                logger.info(f"Background invitation SMS sent to {invitation.recipient_phone} for workspace {invitation.workspace.name}. Response: {result}")
-            else:
-                logger.error(f"Failed to send SMS. Status: {response.status_code}, Response: {result}")
-                raise Exception(f"SMS API error: {result}")
+        # Check if SMS was sent successfully
+        if response.status_code == 200:
+            logger.info(f"Background invitation SMS sent to {invitation.recipient_phone} for workspace {invitation.workspace.name}. Response: {result}")
+        else:
+            logger.error(f"Failed to send SMS. Status: {response.status_code}, Response: {result}")
+            raise Exception(f"SMS API error: {result}")
 
+    except SMSUnavailableError:
+        # Mnotify is down or saturated; retry later rather than spending the job's attempts
+        defer_sms_job(send_invitation_sms_async, deferrals, invitation_id)
     except Exception as e:
         logger.error(f"Failed to send background invitation SMS: {str(e)}")
         raise  # Re-raise to trigger retry
@@ -72,8 +72,8 @@ def workspace_detail(request, pk):
         'membership': membership,
         'projects': projects,
         'members': members,
-        'is_admin': membership.role == 'admin',
-        'is_pm': membership.role in ['admin', 'pm'],
+        'is_admin': membership.is_admin,
+        'is_pm': membership.is_pm,
     }
     return render(request, 'workspaces/workspace_detail.html', context)
 
@@ -145,7 +145,7 @@ def workspace_members(request, pk):
         'workspace': workspace,
         'membership': membership,
         'members': members,
-        'is_admin': membership.role == 'admin',
+        'is_admin': membership.is_admin,
     }
     return render(request, 'workspaces/workspace_members.html', context)
 
@@ -312,13 +312,13 @@ def workspace_invite_user(request, pk):
 
             invitation.save()
 
-            # Queue background tasks for invitation email and SMS
+            # Queue background tasks for invitation email and SMS (only when there is a number to text)
             from .tasks import send_invitation_email_async, send_invitation_sms_async
             send_invitation_email_async(invitation.id)
-            send_invitation_sms_async(invitation.id)
 
             # Success message based on whether phone was provided
             if invitation.recipient_phone:
+                send_invitation_sms_async(invitation.id)
                 messages.success(request, f'Invitation sent to {invitation.recipient_name} via email ({invitation.email}) and SMS ({invitation.recipient_phone})!')
             else:
                 messages.success(request, f'Invitation sent to {invitation.recipient_name} via email ({invitation.email})!')
@@ -428,7 +428,7 @@ def workspace_files_list(request, pk):
         'workspace': workspace,
         'membership': membership,
         'files': files,
-        'is_admin': membership.role == 'admin',
+        'is_admin': membership.is_admin,
     }
     return render(request, 'workspaces/workspace_files.html', context)
 